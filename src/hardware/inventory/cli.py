@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import sys
 import os
 import json
@@ -114,19 +117,32 @@ def _show_rich_help() -> None:
     console.print()
 
 
+# Databases opened by the running command; ``main`` closes them on the way
+# out so a JSON inventory's journal is folded back into its file
+_open_dbs: list[utils.BaseDB] = []
+
+
 def _resolve_db_paths(args: argparse.Namespace) -> utils.BaseDB:
     """Resolve database paths with auto-discovery logic."""
     sqlite_path, json_path = config.resolve_db_paths()
     
     # SQLite is now the primary database
     if sqlite_path:
-        return utils.SQLiteDB(Path(sqlite_path))
+        db = utils.SQLiteDB(Path(sqlite_path))
     elif json_path:
-        return utils.JSONDB(Path(json_path))
+        db = utils.JSONDB(Path(json_path))
     else:
         # This should not happen due to XDG fallback, but just in case
         console.print("[bold red]Error:[/] Could not resolve database path")
         sys.exit(1)
+    _open_dbs.append(db)
+    return db
+
+
+def _close_dbs() -> None:
+    """Close every database opened by the current command."""
+    while _open_dbs:
+        _open_dbs.pop().close()
 
 
 def _show_db_path(db: utils.BaseDB, quiet: bool = False) -> None:
@@ -156,18 +172,16 @@ def _review(candidate: dict, db: utils.BaseDB, service: str) -> dict | None:
 
 def _process(
     path: Path,
+    text: str,
     db: utils.BaseDB,
     args: argparse.Namespace,
     pre: list[str],
     post: list[str],
 ) -> None:
-    """Process a file using OCR extraction."""
-    if args.resume and db.has_file(str(path)):
-        return
-    
-    text = utils.ocr_extract(path, args.service)
-    text_hash = utils.text_hash(text)
-    if db.has_hash(text_hash):
+    """Review and store the OCR text extracted from a file."""
+    # Older inventories store SHA-1 digests: a match on either is a duplicate
+    hashes = utils.text_hashes(text)
+    if any(db.has_hash(h) for h in hashes):
         return
     
     for t in pre:
@@ -181,7 +195,7 @@ def _process(
         for t in post:
             fn = getattr(utils, t, lambda x: x)
             entry = fn(entry)
-        db.add(entry, str(path), text_hash)
+        db.add(entry, str(path), hashes[0])
 
 
 def _import_command(args: argparse.Namespace) -> None:
@@ -257,10 +271,28 @@ def _add_command(args: argparse.Namespace) -> None:
         console.print(f"[red]Path not found: {target}")
         sys.exit(1)
     files.sort()
-
-    for p in files:
-        console.rule(p.name)
-        _process(p, db, args, proc_tools, post_tools)
+    if args.resume:
+        files = [p for p in files if not db.has_file(str(p))]
+
+    # OCR runs ahead on worker threads while earlier files are reviewed, so
+    # the prompts rarely wait on the network. Only ``--jobs`` files are kept
+    # in flight, so stopping early doesn't leave the whole folder paid for.
+    jobs = max(1, args.jobs)
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        queued = iter(files)
+        pending = deque(
+            (p, pool.submit(utils.ocr_extract, p, args.service))
+            for p in itertools.islice(queued, jobs)
+        )
+        while pending:
+            p, ocr = pending.popleft()
+            if (nxt := next(queued, None)) is not None:
+                pending.append((nxt, pool.submit(utils.ocr_extract, nxt, args.service)))
+            console.rule(p.name)
+            _process(p, ocr.result(), db, args, proc_tools, post_tools)
+    finally:
+        pool.shutdown(cancel_futures=True)
 
     console.print("[green]Done. Database updated.[/]")
 
@@ -815,6 +847,8 @@ def _test_command(args: argparse.Namespace) -> None:
             test_argv.append("--ocr")
         if args.search:
             test_argv.append("--search")
+        if args.quiet:
+            test_argv.append("--quiet")
         
         # Replace sys.argv temporarily
         original_argv = sys.argv[:]
@@ -913,6 +947,8 @@ DATABASE OPTIONS:
                            help="File extensions to process")
     add_parser.add_argument("--continue", dest="resume", action="store_true",
                            help="Resume processing, skip already processed files")
+    add_parser.add_argument("--jobs", type=int, default=4,
+                           help="Number of files to OCR concurrently")
 
     # Import command (database import)
     import_parser = subparsers.add_parser("import", help="Import components from another database")
@@ -973,6 +1009,7 @@ DATABASE OPTIONS:
     test_parser.add_argument("--parsing", action="store_true", help="Test OCR text parsing")
     test_parser.add_argument("--ocr", action="store_true", help="Interactive OCR testing")
     test_parser.add_argument("--search", action="store_true", help="Test component search")
+    test_parser.add_argument("--quiet", action="store_true", help="Plain tab-separated output, no interactive prompts")
     
     # Enable argcomplete if available
     if argcomplete:
@@ -984,33 +1021,37 @@ DATABASE OPTIONS:
         _show_rich_help()
         return
     
-    # Route to appropriate command handler using match/case
-    match args.command:
-        case "add":
-            _add_command(args)
-        case "import":
-            _import_command(args)
-        case "list":
-            _list_command(args)
-        case "search":
-            _search_command(args)
-        case "show":
-            _show_command(args)
-        case "update":
-            _update_command(args)
-        case "delete":
-            _delete_command(args)
-        case "stats":
-            _stats_command(args)
-        case "config":
-            _config_command(args)
-        case "info":
-            _info_command(args)
-        case "ask":
-            _ask_command(args)
-        case "chat":
-            _chat_command(args)
-        case "test":
-            _test_command(args)
-        case _:
-            parser.print_help()
+    # Route to appropriate command handler using match/case; databases the
+    # command opened are closed even if it exits early
+    try:
+        match args.command:
+            case "add":
+                _add_command(args)
+            case "import":
+                _import_command(args)
+            case "list":
+                _list_command(args)
+            case "search":
+                _search_command(args)
+            case "show":
+                _show_command(args)
+            case "update":
+                _update_command(args)
+            case "delete":
+                _delete_command(args)
+            case "stats":
+                _stats_command(args)
+            case "config":
+                _config_command(args)
+            case "info":
+                _info_command(args)
+            case "ask":
+                _ask_command(args)
+            case "chat":
+                _chat_command(args)
+            case "test":
+                _test_command(args)
+            case _:
+                parser.print_help()
+    finally:
+        _close_dbs()
@@ -5,21 +5,34 @@ from pathlib import Path
 import tomllib
 
 
+# Resolved once per process; ``resolve_db_paths`` only recomputes these when
+# a test injects explicit ``cwd``/``home`` directories.
+_CWD = Path.cwd()
+_HOME = Path.home()
+_CFG_FILES = (_HOME / ".component_loader.toml", _CWD / "cfg.toml")
+_LOCAL_SQLITE = _CWD / ".hardware-inventory.db"
+_LOCAL_JSON = _CWD / ".hardware-inventory.jsonld"
+_LEGACY_SQLITE = _CWD / "metadata.db"
+_LEGACY_JSON = _CWD / "components.jsonld"
+
+
 def _load_toml(path: Path) -> dict:
-    if path.exists():
-        return tomllib.loads(path.read_text())
-    return {}
+    # EAFP: the common "no config file" case costs one failed open, not a
+    # stat followed by an open
+    try:
+        text = path.read_text()
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    return tomllib.loads(text)
 
 
 # Load configuration from default locations
 def _load_config() -> dict:
     """Load configuration from various locations with precedence."""
     config = {}
-    cwd = Path.cwd()
-    home = Path.home()
 
     # Load configs in order of precedence (later overrides earlier)
-    for path in (home / ".component_loader.toml", cwd / "cfg.toml"):
+    for path in _CFG_FILES:
         config.update(_load_toml(path))
 
     # Set defaults if not specified
@@ -59,37 +72,46 @@ def resolve_db_paths(
     - Falls back to XDG_DATA_HOME/hardware/inventory-main.db
     - SQLite is primary, JSON-LD is optional secondary
     """
-    cwd = Path(cwd or Path.cwd())
-    home = Path(home or Path.home())
-
     # CLI flags override everything
     if db_sqlite or db_json:
         return db_sqlite, db_json
 
+    if cwd is None and home is None:
+        local_sqlite, local_json = _LOCAL_SQLITE, _LOCAL_JSON
+        legacy_sqlite, legacy_json = _LEGACY_SQLITE, _LEGACY_JSON
+        cfg_files = None
+    else:
+        cwd = Path(cwd or _CWD)
+        home = Path(home or _HOME)
+        local_sqlite = cwd / ".hardware-inventory.db"
+        local_json = cwd / ".hardware-inventory.jsonld"
+        legacy_sqlite = cwd / "metadata.db"
+        legacy_json = cwd / "components.jsonld"
+        cfg_files = (home / ".component_loader.toml", cwd / "cfg.toml")
+
     # Check for .hardware-inventory.db in current directory (primary)
-    local_sqlite = cwd / ".hardware-inventory.db"
-    local_json = cwd / ".hardware-inventory.jsonld"
-    
     if local_sqlite.exists():
         # If local SQLite exists, also check for optional JSON-LD
         json_path = str(local_json) if local_json.exists() else None
         return str(local_sqlite), json_path
 
     # Check for legacy files in cwd for backward compatibility
-    legacy_sqlite = cwd / "metadata.db"
-    legacy_json = cwd / "components.jsonld"
     if legacy_sqlite.exists() or legacy_json.exists():
         return (
             str(legacy_sqlite) if legacy_sqlite.exists() else None,
             str(legacy_json) if legacy_json.exists() else None
         )
 
-    # Load configs for custom paths
-    config = {}
-    for path in (home / ".component_loader.toml", cwd / "cfg.toml"):
-        config.update(_load_toml(path))
+    # Load configs for custom paths (the default locations were already
+    # parsed into CONFIG at import time)
+    if cfg_files is None:
+        db_cfg = CONFIG.get("database", {})
+    else:
+        config = {}
+        for path in cfg_files:
+            config.update(_load_toml(path))
+        db_cfg = config.get("database", {})
 
-    db_cfg = config.get("database", {})
     config_sqlite = db_cfg.get("sqlite_path")
     config_json = db_cfg.get("jsonld_path")
     
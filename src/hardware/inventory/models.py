@@ -15,12 +15,20 @@ All models follow best practices:
 
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from enum import Enum
 from typing import Any
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
 
+_QTY_RE = re.compile(r"(\d+)")
+
+
+def _utc_timestamp() -> str:
+    return datetime.utcnow().isoformat()
+
+
 class ComponentType(str, Enum):
     """Standard component types for classification."""
     RESISTOR = "resistor"
@@ -119,8 +127,7 @@ class Component(BaseModel):
         # Try to extract from qty field
         qty_str = info.data.get("qty", "")
         if qty_str:
-            import re
-            match = re.search(r"(\d+)", str(qty_str))
+            match = _QTY_RE.search(str(qty_str))
             if match:
                 return int(match.group(1))
         return None
@@ -135,7 +142,7 @@ class OCRExtractionResult(BaseModel):
     components: list[Component] = Field(default_factory=list, description="Parsed components")
     service: str = Field(description="OCR service used (mistral, openai, gemini, etc.)")
     model: str | None = Field(None, description="Specific model used")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utc_timestamp)
     
     @field_validator("raw_text")
     @classmethod
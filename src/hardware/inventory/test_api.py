@@ -1,34 +1,74 @@
 """Interactive API testing for OCR services and database operations."""
 
 import argparse
+import contextlib
+import functools
 import os
-import tempfile
 import json
 from pathlib import Path
 from datetime import datetime
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.progress import Progress, SpinnerColumn, TextColumn
-
 from . import utils
 from . import config
 
-console = Console()
+# Set by ``main(--quiet)``: emit plain tab-separated lines instead of rich
+# tables/spinners so scripted runs don't pay for terminal rendering.
+QUIET = False
+
+# (display name, environment variable) for every service with an API key
+_API_KEY_ENV = (
+    ("Mistral", "MISTRAL_API_KEY"),
+    ("OpenAI", "OPENAI_API_KEY"),
+    ("OpenRouter", "OPENROUTER_API_KEY"),
+    ("OCR.Space", "OCR_SPACE_API_KEY"),
+)
+
+# Services the interactive OCR test can exercise, keyed by display name
+_INTERACTIVE_SERVICES = {"Mistral": "mistral", "OpenAI": "openai", "OpenRouter": "openrouter"}
+
+# ``--quiet`` never prompts, so the interactive OCR test reports this row instead
+_OCR_SKIPPED = "ocr\tskipped\tinteractive test disabled by --quiet"
+
+
+@functools.cache
+def _console():
+    """Return the shared rich console, importing rich only when needed."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _heading(text: str) -> None:
+    if not QUIET:
+        _console().print(f"\n[bold cyan]{text}[/]")
+
+
+def _print(message: str, plain: str | None = None) -> None:
+    """Print a rich-markup message, or its plain variant under ``--quiet``."""
+    if QUIET:
+        print(plain if plain is not None else message)
+    else:
+        _console().print(message)
+
+
+@functools.cache
+def _probe_api_keys() -> dict[str, str | None]:
+    """Look up every service's API key once per run."""
+    return {service: os.getenv(env) for service, env in _API_KEY_ENV}
 
 
 def test_api_keys():
     """Test API key availability and display status."""
-    console.print("\n[bold cyan]API Key Status[/]")
+    _heading("API Key Status")
+    
+    api_keys = _probe_api_keys()
     
-    api_keys = {
-        "Mistral": os.getenv("MISTRAL_API_KEY"),
-        "OpenAI": os.getenv("OPENAI_API_KEY"),
-        "OpenRouter": os.getenv("OPENROUTER_API_KEY"),
-        "OCR.Space": os.getenv("OCR_SPACE_API_KEY"),
-    }
+    if QUIET:
+        for service, key in api_keys.items():
+            print(f"{service}\t{'available' if key else 'missing'}")
+        return api_keys
+    
+    from rich.table import Table
     
     table = Table()
     table.add_column("Service", style="cyan")
@@ -38,70 +78,79 @@ def test_api_keys():
     for service, key in api_keys.items():
         if key:
             status = "[green]✓ Available[/]"
-            preview = f"{key[:8]}...{key[-4:]}" if len(key) > 12 else key[:8] + "..."
+            head = key[:8]
+            preview = f"{head}...{key[-4:]}" if len(key) > 12 else head + "..."
         else:
             status = "[red]✗ Missing[/]"
             preview = "[dim]Not set[/]"
         
         table.add_row(service, status, preview)
     
-    console.print(table)
+    _console().print(table)
     return api_keys
 
 
 def test_database_operations():
     """Test database operations with example data."""
-    console.print("\n[bold cyan]Database Operations Test[/]")
+    _heading("Database Operations Test")
     
     # Check for example data
     example_data = Path(__file__).parent.parent.parent.parent / "data" / "electronics_updated_1.jsonld"
     
     if not example_data.exists():
-        console.print("[red]Example database not found at data/electronics_updated_1.jsonld[/]")
+        _print("[red]Example database not found at data/electronics_updated_1.jsonld[/]",
+               "database\tskipped\texample database not found")
         return False
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            # Create temporary database
-            temp_db = Path(tempfile.mkdtemp()) / "test_inventory.db"
-            
-            task = progress.add_task("Creating test database...", total=None)
-            db = utils.SQLiteDB(temp_db)
-            
-            progress.update(task, description="Importing example data...")
-            db.import_db(example_data)
-            
-            progress.update(task, description="Testing database operations...")
-            
-            # Test basic operations
-            stats = db.get_stats()
-            components = db.list_all(limit=5)
-            search_results = db.search("resistor")
-            
-            progress.update(task, description="Complete!", completed=100)
+        # Throwaway in-memory database: nothing to clean up on disk
+        with contextlib.closing(utils.SQLiteDB(":memory:")) as db:
+            if QUIET:
+                db.import_db(example_data)
+                stats = db.get_stats()
+                components = db.list_all(limit=5)
+                search_results = db.search("resistor")
+            else:
+                from rich.progress import Progress, SpinnerColumn, TextColumn
+                
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=_console()
+                ) as progress:
+                    task = progress.add_task("Importing example data...", total=None)
+                    db.import_db(example_data)
+                    
+                    progress.update(task, description="Testing database operations...")
+                    
+                    # Test basic operations
+                    stats = db.get_stats()
+                    components = db.list_all(limit=5)
+                    search_results = db.search("resistor")
+                    
+                    progress.update(task, description="Complete!", completed=100)
         
         # Display results
-        console.print(f"[green]✓ Database test successful[/]")
-        console.print(f"Total components: {stats['total_components']}")
-        console.print(f"Component types: {len(stats.get('types', {}))}")
-        console.print(f"Search results for 'resistor': {len(search_results)}")
+        if QUIET:
+            print(f"database\tok\t{stats['total_components']}\t"
+                  f"{len(stats.get('types', {}))}\t{len(search_results)}")
+        else:
+            console = _console()
+            console.print(f"[green]✓ Database test successful[/]")
+            console.print(f"Total components: {stats['total_components']}")
+            console.print(f"Component types: {len(stats.get('types', {}))}")
+            console.print(f"Search results for 'resistor': {len(search_results)}")
         
-        # Cleanup
-        temp_db.unlink()
         return True
         
     except Exception as e:
-        console.print(f"[red]✗ Database test failed: {e}[/]")
+        _print(f"[red]✗ Database test failed: {e}[/]", f"database\tfailed\t{e}")
         return False
 
 
 def test_ocr_parsing():
     """Test OCR text parsing functionality."""
-    console.print("\n[bold cyan]OCR Text Parsing Test[/]")
+    _heading("OCR Text Parsing Test")
     
     test_texts = [
         "10kΩ resistor ±5% tolerance Carbon film 25 pieces $0.05 each",
@@ -111,6 +160,13 @@ def test_ocr_parsing():
         "1N4148 switching diode DO-35 100 pieces",
     ]
     
+    if QUIET:
+        for text in test_texts:
+            print(f"{text}\t{json.dumps(utils.parse_fields(text), ensure_ascii=False)}")
+        return
+    
+    from rich.table import Table
+    
     table = Table()
     table.add_column("Input Text", style="white", width=40)
     table.add_column("Parsed Fields", style="cyan")
@@ -120,22 +176,24 @@ def test_ocr_parsing():
         parsed_str = json.dumps(parsed, indent=None) if parsed else "[dim]No fields parsed[/]"
         table.add_row(text[:37] + "..." if len(text) > 40 else text, parsed_str)
     
-    console.print(table)
-    console.print("[green]✓ OCR parsing test complete[/]")
+    _console().print(table)
+    _console().print("[green]✓ OCR parsing test complete[/]")
 
 
 def interactive_ocr_test():
     """Interactive OCR service testing."""
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.prompt import Confirm, Prompt
+    
+    console = _console()
     console.print("\n[bold cyan]Interactive OCR Service Test[/]")
     
     # Check available APIs
-    available_services = []
-    if os.getenv("MISTRAL_API_KEY"):
-        available_services.append("mistral")
-    if os.getenv("OPENAI_API_KEY"):
-        available_services.append("openai")
-    if os.getenv("OPENROUTER_API_KEY"):
-        available_services.append("openrouter")
+    api_keys = _probe_api_keys()
+    available_services = [
+        name for service, name in _INTERACTIVE_SERVICES.items() if api_keys.get(service)
+    ]
     
     if not available_services:
         console.print("[yellow]No API keys found for testing. Set MISTRAL_API_KEY, OPENAI_API_KEY, or OPENROUTER_API_KEY[/]")
@@ -183,21 +241,17 @@ def interactive_ocr_test():
 
 def test_component_search():
     """Test component search with different queries."""
-    console.print("\n[bold cyan]Component Search Test[/]")
+    _heading("Component Search Test")
     
     # Use example database if available
     example_data = Path(__file__).parent.parent.parent.parent / "data" / "electronics_updated_1.jsonld"
     
     if not example_data.exists():
-        console.print("[yellow]Example database not found - skipping search test[/]")
+        _print("[yellow]Example database not found - skipping search test[/]",
+               "search\tskipped\texample database not found")
         return
     
     try:
-        # Create temporary database with example data
-        temp_db = Path(tempfile.mkdtemp()) / "test_search.db"
-        db = utils.SQLiteDB(temp_db)
-        db.import_db(example_data)
-        
         test_queries = [
             "resistor",
             "10k",
@@ -207,29 +261,39 @@ def test_component_search():
             "ceramic"
         ]
         
-        table = Table()
-        table.add_column("Query", style="cyan")
-        table.add_column("Results", style="white")
-        table.add_column("Sample Component", style="dim")
-        
-        for query in test_queries:
-            results = db.search(query)
-            count = len(results)
-            sample = results[0].get("description", "N/A")[:30] + "..." if results else "No results"
-            table.add_row(query, str(count), sample)
-        
-        console.print(table)
-        console.print("[green]✓ Search test complete[/]")
+        rows = []
+        with contextlib.closing(utils.SQLiteDB(":memory:")) as db:
+            db.import_db(example_data)
+            for query in test_queries:
+                results = db.search(query)
+                count = len(results)
+                sample = results[0].get("description", "N/A")[:30] + "..." if results else "No results"
+                rows.append((query, str(count), sample))
         
-        # Cleanup
-        temp_db.unlink()
+        if QUIET:
+            for row in rows:
+                print("\t".join(row))
+        else:
+            from rich.table import Table
+            
+            table = Table()
+            table.add_column("Query", style="cyan")
+            table.add_column("Results", style="white")
+            table.add_column("Sample Component", style="dim")
+            for row in rows:
+                table.add_row(*row)
+            
+            _console().print(table)
+            _console().print("[green]✓ Search test complete[/]")
         
     except Exception as e:
-        console.print(f"[red]✗ Search test failed: {e}[/]")
+        _print(f"[red]✗ Search test failed: {e}[/]", f"search\tfailed\t{e}")
 
 
 def main():
     """Main test interface."""
+    global QUIET
+    
     parser = argparse.ArgumentParser(description="Interactive API and database testing")
     parser.add_argument("--all", action="store_true", help="Run all tests")
     parser.add_argument("--api-keys", action="store_true", help="Test API key availability")
@@ -237,13 +301,19 @@ def main():
     parser.add_argument("--parsing", action="store_true", help="Test OCR text parsing")
     parser.add_argument("--ocr", action="store_true", help="Interactive OCR testing")
     parser.add_argument("--search", action="store_true", help="Test component search")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Plain tab-separated output, no interactive prompts")
     
     args = parser.parse_args()
+    QUIET = args.quiet
     
-    console.print(Panel.fit(
-        "[bold cyan]Hardware Inventory API & Database Testing[/]",
-        border_style="cyan"
-    ))
+    if not QUIET:
+        from rich.panel import Panel
+        
+        _console().print(Panel.fit(
+            "[bold cyan]Hardware Inventory API & Database Testing[/]",
+            border_style="cyan"
+        ))
     
     if args.all or not any([args.api_keys, args.database, args.parsing, args.ocr, args.search]):
         # Run all tests if no specific test requested
@@ -252,8 +322,13 @@ def main():
         test_ocr_parsing()
         test_component_search()
         
-        if Confirm.ask("\nRun interactive OCR test with real APIs?"):
-            interactive_ocr_test()
+        if QUIET:
+            print(_OCR_SKIPPED)
+        else:
+            from rich.prompt import Confirm
+            
+            if Confirm.ask("\nRun interactive OCR test with real APIs?"):
+                interactive_ocr_test()
     else:
         if args.api_keys:
             test_api_keys()
@@ -264,10 +339,13 @@ def main():
         if args.search:
             test_component_search()
         if args.ocr:
-            interactive_ocr_test()
+            if QUIET:
+                print(_OCR_SKIPPED)
+            else:
+                interactive_ocr_test()
     
-    console.print("\n[bold green]Testing complete![/]")
+    _print("\n[bold green]Testing complete![/]", "done")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
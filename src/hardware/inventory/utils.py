@@ -1,15 +1,76 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import hashlib
+import io
+import itertools
 import json
+import mmap
 import os
 from pathlib import Path
+import random
 import re
 import sqlite3
-from typing import Any, Protocol
+import sys
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Protocol
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+
+# JSON codec: orjson when installed (the ``fast`` extra), stdlib otherwise.
+# Both emit UTF-8 without ASCII escaping, so files stay interchangeable.
+if orjson:
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    _json_dumps_bytes = orjson.dumps
+
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _json_dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+    _json_loads = json.loads
+
+# Model each vision backend requests; the OCR cache is keyed on it too
+DEFAULT_MODELS = {
+    "mistral": "pixtral-large-latest",  # Mistral's latest vision model
+    "openai": "gpt-4o",  # GPT-4o with vision capabilities
+    "openrouter": "anthropic/claude-3-5-sonnet-20241022",  # Vision-capable model via OpenRouter
+    "gemini": "gemini-2.0-flash-exp",  # Google's newest multimodal model (Dec 2024)
+    "anthropic": "claude-3-5-sonnet-20241022",  # Latest Claude with vision (Oct 2024)
+}
 
 # Default service endpoints
 DEFAULT_ENDPOINTS = {
@@ -18,18 +79,35 @@ DEFAULT_ENDPOINTS = {
     "ocr.space": "https://api.ocr.space/parse/image",
     "openai": "https://api.openai.com/v1/chat/completions",
     "openrouter": "https://openrouter.ai/api/v1/chat/completions",
-    "gemini": "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent",
+    "gemini": f"https://generativelanguage.googleapis.com/v1beta/models/{DEFAULT_MODELS['gemini']}:generateContent",
     "anthropic": "https://api.anthropic.com/v1/messages",
 }
 
-# Cutting-edge models for each service
-DEFAULT_MODELS = {
-    "mistral": "pixtral-large-2411",  # Latest Mistral vision model (Nov 2024)
-    "openai": "gpt-4o-2024-11-20",  # Latest GPT-4o with vision (Nov 2024)
-    "openrouter": "anthropic/claude-3.5-sonnet",  # Best-in-class vision via OpenRouter
-    "gemini": "gemini-2.0-flash-exp",  # Google's newest multimodal model (Dec 2024)
-    "anthropic": "claude-3-5-sonnet-20241022",  # Latest Claude with vision (Oct 2024)
-}
+# Structured extraction prompt shared by every vision backend
+_OCR_FIELDS = """For each component, identify:
+- Type (resistor, capacitor, IC, transistor, etc.)
+- Value (resistance, capacitance, part number, etc.)
+- Quantity (if visible)
+- Package type (through-hole, SMD, DIP, etc.)
+- Tolerance or specifications (if visible)
+- Part number or manufacturer code (if visible)"""
+
+_OCR_PROMPT = f"""Extract all electronics component information from this image.
+
+{_OCR_FIELDS}
+
+Format the output as structured text with clear labels. Be precise and thorough."""
+
+# Multi-image variant: ``{count}`` is filled in per request
+_OCR_BATCH_PROMPT = f"""Extract all electronics component information from each of the {{count}} images that follow.
+
+{_OCR_FIELDS}
+
+Respond with only a JSON array of exactly {{count}} strings, one per image in the
+order given, each holding that image's extraction as structured text with clear labels."""
+
+# Part of every OCR cache key, so editing a prompt invalidates old extractions
+_OCR_CACHE_TAG = hashlib.sha1((_OCR_PROMPT + _OCR_BATCH_PROMPT).encode()).hexdigest()[:12]
 
 
 class BaseDB(Protocol):
@@ -51,24 +129,44 @@ class BaseDB(Protocol):
         """Add new entry to database."""
         ...
 
-    def list_all(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
+    def bulk_add(self, entries: Iterable[tuple[dict[str, Any], str, str]]) -> int:
+        """Add many ``(entry, file, hash)`` triples, returning how many were new."""
+        ...
+
+    def list_all(
+        self, limit: int | None = None, offset: int = 0, component_type: str | None = None
+    ) -> list[dict[str, Any]]:
         """List all components with optional pagination.
         
         Args:
             limit: Maximum number of entries to return (None for all)
             offset: Number of entries to skip
+            component_type: Only list components of this type (case-insensitive)
             
         Returns:
             List of component dictionaries
         """
         ...
 
-    def search(self, query: str, field: str | None = None) -> list[dict[str, Any]]:
+    def list_brief(
+        self, limit: int | None = None, offset: int = 0, component_type: str | None = None
+    ) -> list[tuple[Any, Any, Any, Any]]:
+        """Like ``list_all``, but return only ``(id, type, value, qty)`` rows.
+        
+        Missing fields come back as ``None``. Meant for listings that show a
+        one-line summary per component and don't need the full entry.
+        """
+        ...
+
+    def search(
+        self, query: str, field: str | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
         """Search components by text query.
         
         Args:
             query: Search term to match
             field: Specific field to search in (None for all fields)
+            limit: Maximum number of matches to return (None for all)
             
         Returns:
             List of matching component dictionaries
@@ -109,8 +207,8 @@ class BaseDB(Protocol):
         """
         ...
 
-    def count(self) -> int:
-        """Get total number of components in database."""
+    def count(self, component_type: str | None = None) -> int:
+        """Get total number of components, optionally of one type only."""
         ...
 
     def get_stats(self) -> dict[str, Any]:
@@ -129,9 +227,133 @@ class BaseDB(Protocol):
         """Import data from another database file."""
         ...
 
+    def close(self) -> None:
+        """Flush pending writes and release the underlying storage."""
+        ...
+
+
+# One pooled session for all outbound HTTP, so consecutive OCR calls to the
+# same provider reuse a kept-alive TLS connection instead of handshaking
+# each time. requests negotiates gzip/deflate responses by default.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=16))
+
+# Transient statuses worth retrying: throttling and gateway/server hiccups
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _request_with_retry(
+    method: str,
+    url: str,
+    *,
+    max_attempts: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a request on the shared session, retrying transient failures.
+    
+    429/5xx responses and connection errors are retried with exponential
+    backoff plus jitter, honouring a numeric ``Retry-After`` header. The last
+    response is returned (or the last connection error raised) once
+    ``max_attempts`` is exhausted; callers still check the status.
+    """
+    send = _SESSION.post if method == "POST" else _SESSION.get
+    for attempt in range(max_attempts - 1):
+        delay = min(cap, base * 2 ** attempt)
+        try:
+            response = send(url, **kwargs)
+        except requests.ConnectionError:
+            pass
+        else:
+            if response.status_code not in _RETRY_STATUSES:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(cap, float(retry_after))
+        time.sleep(delay + random.uniform(0, 0.25))
+    return send(url, **kwargs)
+
+
+def _post_with_retry(url: str, **kwargs: Any) -> requests.Response:
+    return _request_with_retry("POST", url, **kwargs)
+
+
+def _get_with_retry(url: str, **kwargs: Any) -> requests.Response:
+    return _request_with_retry("GET", url, **kwargs)
+
+
+def _ocr_cache_dir() -> Path:
+    """Return the OCR result cache directory.
+    
+    ``HARDWARE_OCR_CACHE_DIR`` overrides the default of
+    ``$XDG_CACHE_HOME/hardware/ocr`` (``~/.cache/hardware/ocr``).
+    """
+    override = os.getenv("HARDWARE_OCR_CACHE_DIR")
+    if override:
+        return Path(override)
+    cache_home = os.getenv("XDG_CACHE_HOME")
+    return (Path(cache_home) if cache_home else Path.home() / ".cache") / "hardware" / "ocr"
+
+
+def _image_sha1(path: Path) -> str:
+    """Content hash of an image file, used as its OCR cache identity."""
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha1").hexdigest()
+
+
+def _ocr_cache_path(path: Path, service: str) -> Path:
+    """Cache file for ``path`` as extracted by ``service``'s current model and prompts."""
+    key = f"{service}:{_image_sha1(path)}:{DEFAULT_MODELS.get(service, '')}:{_OCR_CACHE_TAG}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return _ocr_cache_dir() / digest[:2] / digest[2:]
+
+
+def _ocr_cache_get(cache_path: Path) -> str | None:
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _ocr_cache_put(cache_path: Path, text: str) -> None:
+    """Write a cache entry atomically so concurrent readers never see a partial file.
+    
+    The cache is best-effort: an unwritable cache directory is ignored. Blank
+    results (e.g. a provider returning empty content) are not cached, so the
+    image is extracted again next time.
+    """
+    if not text.strip():
+        return
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
 
 def ocr_extract(path: Path, service: str) -> str:
-    """Extract text from image using specified service with cutting-edge models."""
+    """Extract text from image using specified service with cutting-edge models.
+    
+    Results are cached on disk by image content, service and model, so
+    re-running on an already processed image skips the API call.
+    """
+    try:
+        cache_path = _ocr_cache_path(path, service)
+    except OSError:
+        # Unreadable image: let the backend report it
+        return _ocr_extract_uncached(path, service)
+    text = _ocr_cache_get(cache_path)
+    if text is None:
+        text = _ocr_extract_uncached(path, service)
+        _ocr_cache_put(cache_path, text)
+    return text
+
+
+def _ocr_extract_uncached(path: Path, service: str) -> str:
     match service:
         case "mistral":
             return _mistral_ocr_extract(path, service)
@@ -147,7 +369,10 @@ def ocr_extract(path: Path, service: str) -> str:
             # Legacy services that use direct file upload
             service_url = DEFAULT_ENDPOINTS[service]
             with path.open("rb") as fh:
-                resp = requests.post(service_url, files={"file": fh})
+                body = _MultipartFileBody(fh, "file", path.name, _get_image_mime_type(path))
+                resp = _SESSION.post(
+                    service_url, data=body, headers={"Content-Type": body.content_type}
+                )
             resp.raise_for_status()
             data = resp.json()
             return data.get("text") or data.get("ParsedResults", [{}])[0].get("ParsedText", "")
@@ -155,24 +380,222 @@ def ocr_extract(path: Path, service: str) -> str:
             raise ValueError(f"Unknown OCR service: {service}")
 
 
+class _MultipartFileBody:
+    """Single-file ``multipart/form-data`` body that streams from disk.
+    
+    ``requests`` builds ``files=`` uploads fully in memory (a copy of the
+    whole image plus the encoded body). This file-like object yields the part
+    header, then the file in chunks, then the closing boundary, and reports
+    its total length so the upload still goes out with a Content-Length.
+    """
+    
+    _CHUNK = 64 * 1024
+    
+    def __init__(self, fh: Any, field: str, filename: str, content_type: str) -> None:
+        boundary = os.urandom(16).hex()
+        filename = filename.replace('"', "%22")
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{boundary}--\r\n".encode()
+        self._fh = fh
+        self._length = len(self._head) + os.fstat(fh.fileno()).st_size + len(self._tail)
+        self._stage = 0  # 0: head, 1: file, 2: tail, 3: done
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self):
+        while chunk := self.read(self._CHUNK):
+            yield chunk
+    
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(self._CHUNK), b""))
+        while self._stage < 3:
+            if self._stage == 0:
+                self._stage = 1
+                return self._head
+            if self._stage == 1:
+                chunk = self._fh.read(size)
+                if chunk:
+                    return chunk
+                self._stage = 2
+                continue
+            self._stage = 3
+            return self._tail
+        return b""
+
+
+class _RateLimiter:
+    """Space request starts at least ``1 / rps`` seconds apart.
+    
+    Each caller reserves the next free slot and sleeps until it, so the
+    limiter never holds a lock while waiting.
+    """
+    
+    def __init__(self, rps: float) -> None:
+        self._interval = 1.0 / rps
+        self._next = 0.0
+    
+    async def wait(self) -> None:
+        now = asyncio.get_running_loop().time()
+        delay = self._next - now
+        self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def ocr_extract_async(path: Path, service: str) -> str:
+    """Async ``ocr_extract``: runs the blocking request in a worker thread."""
+    return await asyncio.to_thread(ocr_extract, path, service)
+
+
+async def ocr_extract_many(
+    paths: Iterable[Path], service: str, concurrency: int = 8, rps: float | None = None
+) -> list[str]:
+    """Run ``ocr_extract`` over many images concurrently.
+    
+    At most ``concurrency`` requests are in flight at once over the shared
+    connection pool, and when ``rps`` is given request starts are spaced to
+    stay under the provider's requests-per-second limit.
+    
+    Returns:
+        Extracted texts, in the same order as ``paths``
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = _RateLimiter(rps) if rps else None
+    
+    async def extract(path: Path) -> str:
+        async with semaphore:
+            if limiter:
+                await limiter.wait()
+            return await ocr_extract_async(path, service)
+    
+    return await asyncio.gather(*(extract(path) for path in paths))
+
+
 def _encode_image_base64(image_path: Path) -> str:
-    """Encode image as base64 string for API."""
+    """Encode image as base64 string for API.
+    
+    The file is memory-mapped rather than read, so only the base64 output is
+    allocated instead of a full in-memory copy of the image as well.
+    """
     with image_path.open("rb") as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
+        try:
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return base64.b64encode(mm).decode("ascii")
+        except ValueError:
+            # Empty files can't be mapped
+            return ""
+
+
+# 57 KiB is a multiple of 3, so every chunk but the last encodes without padding
+_B64_CHUNK = 57 * 1024
+
+
+def _encode_image_data_url(image_path: Path) -> str:
+    """Encode image as a ``data:`` URL for chat-completions ``image_url`` parts.
+    
+    Encodings are memoised on path, mtime and size, so an image sent again
+    (``ocr_extract_batch`` resending a malformed batch one image at a time,
+    a rerun) is not re-read and re-encoded, while an edited file is.
+    """
+    st = image_path.stat()
+    return _build_data_url(str(image_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _build_data_url(path: str, mtime_ns: int, size: int) -> str:
+    image_path = Path(path)
+    if Image is not None and (shrunk := _shrink_image(image_path)) is not None:
+        return "data:image/jpeg;base64," + base64.b64encode(shrunk).decode("ascii")
+    
+    # The base64 text is appended chunk by chunk into one buffer behind the
+    # prefix and decoded once, instead of building the base64 string and
+    # then copying it again into an f-string
+    buf = bytearray(f"data:{_get_image_mime_type(image_path)};base64,".encode("ascii"))
+    with image_path.open("rb") as image_file:
+        while chunk := image_file.read(_B64_CHUNK):
+            buf += base64.b64encode(chunk)
+    return buf.decode("ascii")
+
+
+# Vision models downsample larger images before reading them (OpenAI fits
+# high-detail images into 2048x2048), so extra pixels only cost upload
+# bandwidth. With Pillow installed (the ``images`` extra), images larger than
+# this are shrunk and re-encoded as JPEG before going into a data URL.
+_MAX_IMAGE_SIDE = 2048
+_JPEG_QUALITY = 85
+
+
+def _shrink_image(image_path: Path) -> bytes | None:
+    """Return ``image_path`` downscaled to ``_MAX_IMAGE_SIDE`` as JPEG bytes.
+    
+    Returns None when the image is already small enough or Pillow can't
+    read it, in which case the original file is sent unchanged.
+    """
+    try:
+        with Image.open(image_path) as im:
+            # Only the header has been read so far
+            if max(im.size) <= _MAX_IMAGE_SIDE:
+                return None
+            # Re-encoding drops EXIF, so bake the camera rotation in first
+            im = ImageOps.exif_transpose(im)
+            im.thumbnail((_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            im.convert("RGB").save(out, "JPEG", quality=_JPEG_QUALITY)
+    except (OSError, Image.DecompressionBombError):
+        return None
+    return out.getvalue()
+
+
+_MIME_TYPES = MappingProxyType({
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp'
+})
 
 
 def _get_image_mime_type(image_path: Path) -> str:
     """Get MIME type for image file."""
-    suffix = image_path.suffix.lower()
-    mime_types = {
-        '.png': 'image/png',
-        '.jpg': 'image/jpeg', 
-        '.jpeg': 'image/jpeg',
-        '.gif': 'image/gif',
-        '.bmp': 'image/bmp',
-        '.webp': 'image/webp'
-    }
-    return mime_types.get(suffix, 'image/jpeg')
+    return _MIME_TYPES.get(image_path.suffix.lower(), 'image/jpeg')
+
+
+# API key environment variable for each chat-completions service
+_CHAT_API_KEYS = MappingProxyType({
+    "mistral": "MISTRAL_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "openrouter": "OPENROUTER_API_KEY",
+})
+
+# OpenRouter attributes requests to the calling app through these headers
+_OPENROUTER_HEADERS = MappingProxyType({
+    "HTTP-Referer": "https://github.com/matias-ceau/hardware",
+    "X-Title": "Hardware Inventory OCR",
+})
+
+
+def _auth_headers(service: str) -> dict[str, str]:
+    """Build JSON request headers carrying ``service``'s API key.
+    
+    Raises:
+        ValueError: If the service's API key environment variable is not set
+    """
+    env = _CHAT_API_KEYS[service]
+    api_key = os.getenv(env)
+    if not api_key:
+        raise ValueError(f"{env} environment variable not set")
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+    if service == "openrouter":
+        headers.update(_OPENROUTER_HEADERS)
+    return headers
 
 
 def test_api_connectivity(service: str) -> bool:
@@ -194,6 +617,19 @@ def test_api_connectivity(service: str) -> bool:
         return False
 
 
+def test_api_connectivity_many(services: Iterable[str]) -> dict[str, bool]:
+    """Check several services at once, overlapping their network round trips.
+    
+    Returns:
+        ``{service: reachable}`` in the order given
+    """
+    services = list(services)
+    if not services:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(services)) as pool:
+        return dict(zip(services, pool.map(test_api_connectivity, services)))
+
+
 def _test_gemini_connectivity() -> bool:
     """Test Google Gemini API connectivity."""
     api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
@@ -202,7 +638,7 @@ def _test_gemini_connectivity() -> bool:
     
     # Test with models endpoint
     url = f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
-    response = requests.get(url, timeout=10)
+    response = _get_with_retry(url, timeout=10)
     return response.status_code == 200
 
 
@@ -222,7 +658,7 @@ def _test_anthropic_connectivity() -> bool:
         "max_tokens": 1,
         "messages": [{"role": "user", "content": "test"}]
     }
-    response = requests.post(
+    response = _SESSION.post(
         "https://api.anthropic.com/v1/messages", 
         headers=headers, 
         json=payload, 
@@ -231,78 +667,48 @@ def _test_anthropic_connectivity() -> bool:
     return response.status_code in [200, 429]  # 429 means API key works but rate limited
 
 
-def _test_mistral_connectivity() -> bool:
-    """Test Mistral API connectivity using models endpoint."""
-    api_key = os.getenv("MISTRAL_API_KEY")
-    if not api_key:
+def _test_models_endpoint(service: str, url: str) -> bool:
+    """Check a chat service's API key against its (free) models endpoint."""
+    if not os.getenv(_CHAT_API_KEYS[service]):
         return False
-    
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get("https://api.mistral.ai/v1/models", headers=headers, timeout=10)
+    response = _get_with_retry(url, headers=_auth_headers(service), timeout=10)
     return response.status_code == 200
 
 
+def _test_mistral_connectivity() -> bool:
+    """Test Mistral API connectivity using models endpoint."""
+    return _test_models_endpoint("mistral", "https://api.mistral.ai/v1/models")
+
+
 def _test_openai_connectivity() -> bool:
     """Test OpenAI API connectivity using models endpoint."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return False
-    
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get("https://api.openai.com/v1/models", headers=headers, timeout=10)
-    return response.status_code == 200
+    return _test_models_endpoint("openai", "https://api.openai.com/v1/models")
 
 
 def _test_openrouter_connectivity() -> bool:
     """Test OpenRouter API connectivity using models endpoint."""
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        return False
-    
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get("https://openrouter.ai/api/v1/models", headers=headers, timeout=10)
-    return response.status_code == 200
+    return _test_models_endpoint("openrouter", "https://openrouter.ai/api/v1/models")
 
 
 def _mistral_ocr_extract(path: Path, service: str) -> str:
     """Extract text using Mistral Vision API with latest model."""
-    api_key = os.getenv("MISTRAL_API_KEY")
-    if not api_key:
-        raise ValueError("MISTRAL_API_KEY environment variable not set")
-    
-    base64_image = _encode_image_base64(path)
-    mime_type = _get_image_mime_type(path)
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
+    headers = _auth_headers(service)
+    data_url = _encode_image_data_url(path)
     
-    # Improved structured prompt for better extraction
     payload = {
-        "model": "pixtral-large-latest",  # Mistral's latest vision model (Oct 2025)
+        "model": DEFAULT_MODELS[service],
         "messages": [
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
-                        "text": """Extract all electronics component information from this image.
-                        
-For each component, identify:
-- Type (resistor, capacitor, IC, transistor, etc.)
-- Value (resistance, capacitance, part number, etc.)
-- Quantity (if visible)
-- Package type (through-hole, SMD, DIP, etc.)
-- Tolerance or specifications (if visible)
-- Part number or manufacturer code (if visible)
-
-Format the output as structured text with clear labels. Be precise and thorough."""
+                        "text": _OCR_PROMPT
                     },
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:{mime_type};base64,{base64_image}"
+                            "url": data_url
                         }
                     }
                 ]
@@ -312,7 +718,7 @@ Format the output as structured text with clear labels. Be precise and thorough.
         "temperature": 0.1  # Low temperature for consistent extraction
     }
     
-    response = requests.post(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
+    response = _post_with_retry(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
     response.raise_for_status()
     
     data = response.json()
@@ -321,43 +727,23 @@ Format the output as structured text with clear labels. Be precise and thorough.
 
 def _openai_ocr_extract(path: Path, service: str) -> str:
     """Extract text using OpenAI Vision API with latest model."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable not set")
-    
-    base64_image = _encode_image_base64(path)
-    mime_type = _get_image_mime_type(path)
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
+    headers = _auth_headers(service)
+    data_url = _encode_image_data_url(path)
     
-    # Improved structured prompt for better extraction
     payload = {
-        "model": "gpt-4o",  # GPT-4o with vision capabilities (latest as of Oct 2025)
+        "model": DEFAULT_MODELS[service],
         "messages": [
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
-                        "text": """Extract all electronics component information from this image.
-                        
-For each component, identify:
-- Type (resistor, capacitor, IC, transistor, etc.)
-- Value (resistance, capacitance, part number, etc.)
-- Quantity (if visible)
-- Package type (through-hole, SMD, DIP, etc.)
-- Tolerance or specifications (if visible)
-- Part number or manufacturer code (if visible)
-
-Format the output as structured text with clear labels. Be precise and thorough."""
+                        "text": _OCR_PROMPT
                     },
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:{mime_type};base64,{base64_image}"
+                            "url": data_url
                         }
                     }
                 ]
@@ -367,7 +753,7 @@ Format the output as structured text with clear labels. Be precise and thorough.
         "temperature": 0.1  # Low temperature for consistent extraction
     }
     
-    response = requests.post(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
+    response = _post_with_retry(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
     response.raise_for_status()
     
     data = response.json()
@@ -376,45 +762,23 @@ Format the output as structured text with clear labels. Be precise and thorough.
 
 def _openrouter_ocr_extract(path: Path, service: str) -> str:
     """Extract text using OpenRouter with latest vision-capable models."""
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        raise ValueError("OPENROUTER_API_KEY environment variable not set")
-    
-    base64_image = _encode_image_base64(path)
-    mime_type = _get_image_mime_type(path)
-    
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/matias-ceau/hardware",
-        "X-Title": "Hardware Inventory OCR"
-    }
+    headers = _auth_headers(service)
+    data_url = _encode_image_data_url(path)
     
-    # Improved structured prompt for better extraction
     payload = {
-        "model": "anthropic/claude-3-5-sonnet-20241022",  # Vision-capable model (Oct 2025)
+        "model": DEFAULT_MODELS[service],
         "messages": [
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
-                        "text": """Extract all electronics component information from this image.
-                        
-For each component, identify:
-- Type (resistor, capacitor, IC, transistor, etc.)
-- Value (resistance, capacitance, part number, etc.)
-- Quantity (if visible)
-- Package type (through-hole, SMD, DIP, etc.)
-- Tolerance or specifications (if visible)
-- Part number or manufacturer code (if visible)
-
-Format the output as structured text with clear labels. Be precise and thorough."""
+                        "text": _OCR_PROMPT
                     },
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:{mime_type};base64,{base64_image}"
+                            "url": data_url
                         }
                     }
                 ]
@@ -424,13 +788,115 @@ Format the output as structured text with clear labels. Be precise and thorough.
         "temperature": 0.1
     }
     
-    response = requests.post(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
+    response = _post_with_retry(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
     response.raise_for_status()
     
     data = response.json()
     return data["choices"][0]["message"]["content"]
 
 
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _chat_ocr_extract_batch(paths: list[Path], service: str) -> list[str]:
+    """Send several images in one chat-completions request.
+    
+    Returns:
+        One extraction per image, aligned with ``paths``
+    
+    Raises:
+        ValueError: If the reply is not a JSON array with one item per image
+    """
+    headers = _auth_headers(service)
+    content: list[dict[str, Any]] = [
+        {"type": "text", "text": _OCR_BATCH_PROMPT.format(count=len(paths))}
+    ]
+    for path in paths:
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": _encode_image_data_url(path)
+            }
+        })
+    payload = {
+        "model": DEFAULT_MODELS[service],
+        "messages": [{"role": "user", "content": content}],
+        "max_tokens": 2000 * len(paths),
+        "temperature": 0.1
+    }
+    
+    response = _post_with_retry(
+        DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30 * len(paths)
+    )
+    response.raise_for_status()
+    
+    reply = response.json()["choices"][0]["message"]["content"]
+    try:
+        results = _json_loads(_FENCE_RE.sub("", reply.strip()))
+    except ValueError:
+        results = None
+    if not isinstance(results, list) or len(results) != len(paths):
+        raise ValueError(f"{service} batch reply is not a JSON array of {len(paths)} items")
+    return [item if isinstance(item, str) else _json_dumps(item) for item in results]
+
+
+def _mistral_ocr_extract_batch(paths: list[Path]) -> list[str]:
+    """Extract text from several images with one Mistral Vision request."""
+    return _chat_ocr_extract_batch(paths, "mistral")
+
+
+def _openai_ocr_extract_batch(paths: list[Path]) -> list[str]:
+    """Extract text from several images with one OpenAI Vision request."""
+    return _chat_ocr_extract_batch(paths, "openai")
+
+
+def _openrouter_ocr_extract_batch(paths: list[Path]) -> list[str]:
+    """Extract text from several images with one OpenRouter request."""
+    return _chat_ocr_extract_batch(paths, "openrouter")
+
+
+_BATCH_EXTRACTORS = MappingProxyType({
+    "mistral": _mistral_ocr_extract_batch,
+    "openai": _openai_ocr_extract_batch,
+    "openrouter": _openrouter_ocr_extract_batch,
+})
+
+
+def ocr_extract_batch(paths: Iterable[Path], service: str, batch_size: int = 8) -> list[str]:
+    """Extract text from many images, several images per API call.
+    
+    Chat-completions services (mistral, openai, openrouter) receive up to
+    ``batch_size`` images per request; other services fall back to one
+    ``ocr_extract`` call per image. A batch whose reply can't be split into
+    one text per image is retried one image per request, so it doesn't
+    discard the other batches' results.
+    
+    Returns:
+        Extracted texts, in the same order as ``paths``
+    """
+    paths = list(paths)
+    extract = _BATCH_EXTRACTORS.get(service)
+    if extract is None:
+        return [ocr_extract(path, service) for path in paths]
+    # Serve cache hits first; only the misses are sent, batch_size at a time
+    cache_paths = [_ocr_cache_path(path, service) for path in paths]
+    results = [_ocr_cache_get(cache_path) for cache_path in cache_paths]
+    misses = [i for i, text in enumerate(results) if text is None]
+    for start in range(0, len(misses), batch_size):
+        chunk = misses[start:start + batch_size]
+        if len(chunk) > 1:
+            try:
+                texts = extract([paths[i] for i in chunk])
+            except ValueError:
+                texts = [_ocr_extract_uncached(paths[i], service) for i in chunk]
+        else:
+            texts = [_ocr_extract_uncached(paths[chunk[0]], service)]
+        for i, text in zip(chunk, texts):
+            _ocr_cache_put(cache_paths[i], text)
+            results[i] = text
+    return results
+
+
 def _gemini_ocr_extract(path: Path, service: str) -> str:
     """Extract text using Google Gemini 2.0 Flash - newest multimodal model."""
     api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
@@ -448,17 +914,7 @@ def _gemini_ocr_extract(path: Path, service: str) -> str:
             {
                 "parts": [
                     {
-                        "text": """Extract all electronics component information from this image.
-                        
-For each component, identify:
-- Type (resistor, capacitor, IC, transistor, etc.)
-- Value (resistance, capacitance, part number, etc.)
-- Quantity (if visible)
-- Package type (through-hole, SMD, DIP, etc.)
-- Tolerance or specifications (if visible)
-- Part number or manufacturer code (if visible)
-
-Format the output as structured text with clear labels. Be precise and thorough."""
+                        "text": _OCR_PROMPT
                     },
                     {
                         "inline_data": {
@@ -475,7 +931,7 @@ Format the output as structured text with clear labels. Be precise and thorough.
         }
     }
     
-    response = requests.post(url, headers={"Content-Type": "application/json"}, json=payload, timeout=30)
+    response = _post_with_retry(url, headers={"Content-Type": "application/json"}, json=payload, timeout=30)
     response.raise_for_status()
     
     data = response.json()
@@ -503,7 +959,7 @@ def _anthropic_ocr_extract(path: Path, service: str) -> str:
     
     # Anthropic has a different API structure
     payload = {
-        "model": DEFAULT_MODELS["anthropic"],  # claude-3-5-sonnet-20241022 - latest
+        "model": DEFAULT_MODELS[service],
         "max_tokens": 2000,
         "temperature": 0.1,
         "messages": [
@@ -520,41 +976,26 @@ def _anthropic_ocr_extract(path: Path, service: str) -> str:
                     },
                     {
                         "type": "text",
-                        "text": """Extract all electronics component information from this image.
-                        
-For each component, identify:
-- Type (resistor, capacitor, IC, transistor, etc.)
-- Value (resistance, capacitance, part number, etc.)
-- Quantity (if visible)
-- Package type (through-hole, SMD, DIP, etc.)
-- Tolerance or specifications (if visible)
-- Part number or manufacturer code (if visible)
-
-Format the output as structured text with clear labels. Be precise and thorough."""
+                        "text": _OCR_PROMPT
                     }
                 ]
             }
         ]
     }
     
-    response = requests.post(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
+    response = _post_with_retry(DEFAULT_ENDPOINTS[service], headers=headers, json=payload, timeout=30)
     response.raise_for_status()
     
     data = response.json()
     return data["content"][0]["text"]
 
 
-def parse_fields(text: str) -> dict[str, Any]:
-    """Parse component fields from OCR text with improved patterns.
-    
-    Extracts:
-    - Component type (resistor, capacitor, IC, etc.)
-    - Value (resistance, capacitance, part number)
-    - Quantity (number of pieces)
-    - Package type (SMD, through-hole, etc.)
-    - Additional specs (tolerance, voltage, etc.)
-    """
-    field_patterns = {
+# Field patterns for ``parse_fields``, compiled once. Each field keeps its
+# own pattern: several overlap (a "16V" is both a value and a voltage), so a
+# single alternation would let one field's match hide another's.
+_FIELD_PATTERNS = tuple(
+    (key, re.compile(pattern, re.I))
+    for key, pattern in {
         # Values with units
         "value": r"([0-9\.]+\s*(?:[µu]F|nF|pF|kΩ|Ω|mH|uH|H|V|mV|kV|W|mW|A|mA|%))",
         "qty": r"([0-9]+)\s*(?:pcs?|pieces?|units?)",
@@ -567,43 +1008,78 @@ def parse_fields(text: str) -> dict[str, Any]:
         "tolerance": r"([±]\s*[0-9\.]+\s*%)",
         # Voltage rating
         "voltage": r"([0-9\.]+\s*[mkKM]?V)(?:\s+rated)?",
-    }
+    }.items()
+)
+
+# Component type keywords, in priority order (first listed wins when several
+# appear), fused into one named-group alternation so the text is scanned once
+_TYPE_PATTERNS = {
+    "resistor": r"\b(?:resistor|resistance)\b",
+    "capacitor": r"\b(?:capacitor|capacitance)\b",
+    "ic": r"\b(?:IC|integrated\s+circuit|chip)\b",
+    "transistor": r"\b(?:transistor|BJT|MOSFET|FET)\b",
+    "diode": r"\b(?:diode|LED)\b",
+    "inductor": r"\b(?:inductor|inductance|coil)\b",
+}
+_TYPE_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _TYPE_PATTERNS.items()), re.I
+)
+_TYPE_RANK = {name: rank for rank, name in enumerate(_TYPE_PATTERNS)}
+
+# Every line boundary str.splitlines() recognises
+_LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+
+
+def parse_fields(text: str) -> dict[str, Any]:
+    """Parse component fields from OCR text with improved patterns.
     
+    Extracts:
+    - Component type (resistor, capacitor, IC, etc.)
+    - Value (resistance, capacitance, part number)
+    - Quantity (number of pieces)
+    - Package type (SMD, through-hole, etc.)
+    - Additional specs (tolerance, voltage, etc.)
+    
+    Results are memoised per text (re-runs and retries often see the same
+    OCR output); callers get their own copy to modify.
+    """
+    return dict(_parse_fields(text))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_fields(text: str) -> dict[str, Any]:
+    if not text:
+        return {"description": "Component"}
     data: dict[str, Any] = {}
     
     # Extract fields using patterns
-    for key, pattern in field_patterns.items():
-        m = re.search(pattern, text, re.I)
+    for key, pattern in _FIELD_PATTERNS:
+        m = pattern.search(text)
         if m:
             data[key] = m.group(1).strip()
     
     # Extract component type from common keywords
-    type_patterns = {
-        "resistor": r"\b(?:resistor|resistance)\b",
-        "capacitor": r"\b(?:capacitor|capacitance)\b",
-        "ic": r"\b(?:IC|integrated\s+circuit|chip)\b",
-        "transistor": r"\b(?:transistor|BJT|MOSFET|FET)\b",
-        "diode": r"\b(?:diode|LED)\b",
-        "inductor": r"\b(?:inductor|inductance|coil)\b",
-    }
+    best = None
+    for m in _TYPE_RE.finditer(text):
+        if best is None or _TYPE_RANK[m.lastgroup] < _TYPE_RANK[best]:
+            best = m.lastgroup
+            if _TYPE_RANK[best] == 0:
+                break
+    if best is not None:
+        data["type"] = best
     
-    for comp_type, pattern in type_patterns.items():
-        if re.search(pattern, text, re.I):
-            data["type"] = comp_type
-            break
-    
-    # Use first line as description if not too long
-    lines = text.splitlines()
-    if lines:
-        first_line = lines[0].strip()
-        if len(first_line) <= 120:
-            data["description"] = first_line
-        else:
-            # Try to extract a reasonable description from structured text
-            for line in lines[:3]:
-                if line.strip() and not line.startswith("For each") and not line.startswith("-"):
-                    data["description"] = line.strip()[:120]
-                    break
+    # Use first line as description if not too long; the text is only split
+    # (and then only into three lines) when the first line is unusable
+    nl = _LINE_BREAK_RE.search(text)
+    first_line = (text if nl is None else text[:nl.start()]).strip()
+    if len(first_line) <= 120:
+        data["description"] = first_line
+    else:
+        # Try to extract a reasonable description from structured text
+        for line in _LINE_BREAK_RE.split(text, 3)[:3]:
+            if line.strip() and not line.startswith("For each") and not line.startswith("-"):
+                data["description"] = line.strip()[:120]
+                break
     
     # If no description, create one from available data
     if "description" not in data:
@@ -619,8 +1095,50 @@ def parse_fields(text: str) -> dict[str, Any]:
     return data
 
 
-def text_hash(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+_HASH_CHUNK = 1 << 16
+
+
+def text_hash(text: str | bytes) -> str:
+    """Return a 40-hex-digit content hash used for deduplication.
+    
+    BLAKE2b (stdlib, SIMD-optimised) truncated to 20 bytes, so digests keep
+    the same width as the SHA-1 ones stored by earlier versions.
+    """
+    return _hash_text(_new_text_hasher(), text)
+
+
+def text_hashes(text: str | bytes) -> tuple[str, str]:
+    """Return every digest ``text`` may be stored under, newest first.
+    
+    Inventories written before the switch to BLAKE2b hold SHA-1 digests, and
+    those rows are never rewritten (the OCR text they were computed from is
+    not stored), so duplicate checks must match either one. New rows are
+    always stored under ``text_hash``, the first item.
+    """
+    return text_hash(text), _hash_text(hashlib.sha1(usedforsecurity=False), text)
+
+
+def _hash_text(h: Any, text: str | bytes) -> str:
+    if isinstance(text, bytes):
+        h.update(text)
+    else:
+        # Encode in slices so a multi-MB OCR text is never copied whole
+        for start in range(0, len(text), _HASH_CHUNK):
+            h.update(text[start:start + _HASH_CHUNK].encode("utf-8"))
+    return h.hexdigest()
+
+
+def text_hash_stream(fh: Any) -> str:
+    """``text_hash`` of a binary file object's contents, read in blocks."""
+    return hashlib.file_digest(fh, _new_text_hasher).hexdigest()
+
+
+def _new_text_hasher() -> Any:
+    return hashlib.blake2b(digest_size=20, usedforsecurity=False)
+
+
+# Keys of a JSON-LD ComponentCollection that hold component lists
+_COLLECTION_KEYS = ("resistors", "capacitors", "transistors", "ICs", "potentiometers", "passives", "components")
 
 
 def parse_jsonld_components(imported_data: dict | list, source_path: Path) -> list[dict[str, Any]]:
@@ -636,20 +1154,57 @@ def parse_jsonld_components(imported_data: dict | list, source_path: Path) -> li
         graph = imported_data["@graph"]
         if isinstance(graph, list):
             for item in graph:
-                if item.get("@type") == "ComponentCollection":
-                    # Extract components from different collections
-                    for collection_key in ["resistors", "capacitors", "transistors", "ICs", "potentiometers", "passives", "components"]:
-                        if collection_key in item:
-                            collection = item[collection_key]
-                            if isinstance(collection, list):
-                                for component in collection:
-                                    normalized = normalize_jsonld_component(component, collection_key, source_path)
-                                    if normalized:
-                                        components_to_add.append(normalized)
+                components_to_add.extend(_iter_collection_components(item, source_path))
     
     return components_to_add
 
 
+def _iter_collection_components(item: Any, source_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the normalised components of one ``@graph`` item."""
+    if not (isinstance(item, dict) and item.get("@type") == "ComponentCollection"):
+        return
+    # Extract components from different collections
+    for collection_key in _COLLECTION_KEYS:
+        collection = item.get(collection_key)
+        if not isinstance(collection, list):
+            continue
+        for component in collection:
+            normalized = normalize_jsonld_component(component, collection_key, source_path)
+            if normalized:
+                yield normalized
+
+
+def _iter_import_components(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the components of a JSON list or JSON-LD file.
+    
+    With ijson installed (the ``stream`` extra) the file is parsed
+    incrementally, one list entry or ``@graph`` item at a time, so memory
+    stays bounded by the largest collection rather than the whole file.
+    Otherwise it is loaded in one go and handed to
+    ``parse_jsonld_components``.
+    """
+    if ijson is None:
+        yield from parse_jsonld_components(_json_loads(path.read_bytes()), path)
+        return
+    with path.open("rb") as fh:
+        head = b""
+        while not head and (chunk := fh.read(4096)):
+            head = chunk.lstrip()
+        fh.seek(0)
+        if head.startswith(b"["):
+            # Legacy list format: entries are stored as-is
+            yield from ijson.items(fh, "item", use_float=True)
+        elif head.startswith(b"{"):
+            for item in ijson.items(fh, "@graph.item", use_float=True):
+                yield from _iter_collection_components(item, path)
+
+
+def _stable_hash(obj: Any) -> str:
+    """Short content hash that, unlike ``hash()``, is the same in every process."""
+    canonical = json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=6, usedforsecurity=False).hexdigest()
+
+
 def normalize_jsonld_component(component: dict[str, Any], collection_type: str, source_path: Path) -> dict[str, Any] | None:
     """Normalize a component from JSON-LD format to our internal format."""
     if not isinstance(component, dict):
@@ -675,18 +1230,18 @@ def normalize_jsonld_component(component: dict[str, Any], collection_type: str,
             if part_num:
                 normalized["id"] = f"t_{part_num}"
             else:
-                normalized["id"] = f"t_{hash(str(component)) % 10000}"
+                normalized["id"] = f"t_{_stable_hash(component)}"
         elif component_type == "ic":
             part_num = component.get("partNumber", "")
             ic_type = component.get("icType", "")
             if part_num:
                 normalized["id"] = f"ic_{part_num}"
             elif ic_type:
-                normalized["id"] = f"ic_{ic_type}_{hash(str(component)) % 10000}"
+                normalized["id"] = f"ic_{ic_type}_{_stable_hash(component)}"
             else:
-                normalized["id"] = f"ic_{hash(str(component)) % 10000}"
+                normalized["id"] = f"ic_{_stable_hash(component)}"
         else:
-            normalized["id"] = f"{component_type}_{hash(str(component)) % 10000}"
+            normalized["id"] = f"{component_type}_{_stable_hash(component)}"
     else:
         normalized["id"] = component["id"]
     
@@ -763,12 +1318,39 @@ def normalize_jsonld_component(component: dict[str, Any], collection_type: str,
     return normalized
 
 
+def _entry_type(entry: dict[str, Any]) -> Any:
+    """Type an entry is counted and filtered under; untyped ones are "unknown"."""
+    component_type = entry.get("type")
+    return "unknown" if component_type is None else component_type
+
+
+# Component fields with few distinct values across an inventory
+_INTERNED_FIELDS = ("type", "package", "manufacturer", "voltageUnit", "powerUnit")
+
+
+def _intern_fields(entry: dict[str, Any]) -> None:
+    """Share one string object per distinct low-cardinality value."""
+    for key in _INTERNED_FIELDS:
+        value = entry.get(key)
+        if type(value) is str:
+            entry[key] = sys.intern(value)
+
+
 class JSONDB:
     """JSON file database backend for hardware component inventory.
     
     Simple file-based storage using JSON format for portability and
     easy inspection. Good for smaller inventories and cross-platform use.
     
+    Mutations are appended to a JSON Lines journal next to the database
+    file (``<name>.journal``) instead of rewriting the whole file each time;
+    the journal is replayed on load and folded back into the JSON file by
+    ``compact()``, on ``close()``, or once it grows past
+    ``COMPACT_THRESHOLD`` records. Each record is handed to the OS as it is
+    written, except inside a ``with db:`` block, where records are buffered
+    and written (and fsynced) once when the outermost block exits; leaving
+    the block does not compact, so a batch costs only its own records.
+    
     Features:
     - Human-readable JSON format
     - Easy backup and version control
@@ -776,6 +1358,8 @@ class JSONDB:
     - Simple to inspect and debug
     """
     
+    COMPACT_THRESHOLD = 1000
+    
     def __init__(self, path: Path) -> None:
         """Initialize JSON database.
         
@@ -784,14 +1368,19 @@ class JSONDB:
         """
         self.path = path
         self.db_path = str(path)  # For consistent interface
+        self.journal_path = path.with_name(path.name + ".journal")
+        self._journal_fp = None
+        self._journal_ops = 0
+        self._batch_depth = 0
         
         # Ensure parent directory exists
         path.parent.mkdir(parents=True, exist_ok=True)
+        self._recover_compaction()
         
         # Load or initialize empty database
         if path.exists():
             try:
-                self.entries = json.loads(path.read_text())
+                self.entries = _json_loads(path.read_bytes())
                 if not isinstance(self.entries, list):
                     # Handle legacy formats
                     self.entries = []
@@ -802,16 +1391,189 @@ class JSONDB:
         else:
             self.entries = []
             self._save()
+        
+        self._reindex()
+        self._replay_journal()
+    
+    def __enter__(self) -> "JSONDB":
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, *exc_info: object) -> None:
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush()
     
     def _save(self) -> None:
         """Save entries to disk with pretty formatting."""
-        self.path.write_text(json.dumps(self.entries, indent=2, ensure_ascii=False))
+        tmp = self._tmp_path()
+        tmp.write_text(_json_dumps_pretty(self.entries))
+        os.replace(tmp, self.path)
+
+    def _tmp_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".tmp")
+
+    def _recover_compaction(self) -> None:
+        """Finish or discard a compaction interrupted by a crash.
+        
+        ``compact()`` writes the snapshot to a temp file, removes the journal
+        and then renames the temp file over the database. A leftover temp
+        file next to a journal is stale; one without a journal is the newest
+        full snapshot.
+        """
+        tmp = self._tmp_path()
+        if not tmp.exists():
+            return
+        if self.journal_path.exists():
+            tmp.unlink()
+            return
+        try:
+            _json_loads(tmp.read_bytes())
+        except json.JSONDecodeError:
+            tmp.unlink()
+        else:
+            os.replace(tmp, self.path)
+
+    def _replay_journal(self) -> None:
+        """Apply journaled mutations recorded since the last compaction."""
+        try:
+            lines = self.journal_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                record = _json_loads(line)
+            except json.JSONDecodeError:
+                # Torn final write: fold what we have into the snapshot so
+                # later appends don't land after the bad line
+                self.compact()
+                return
+            self._apply(record)
+            self._journal_ops += 1
+
+    def _apply(self, record: dict[str, Any]) -> bool:
+        """Apply one journal record to the in-memory entries and indexes."""
+        op = record["op"]
+        if op == "add":
+            self.entries.append(record["entry"])
+            self._index_entry(len(self.entries) - 1, record["entry"])
+            return True
+        if op == "extend":
+            start = len(self.entries)
+            self.entries.extend(record["entries"])
+            for i, entry in enumerate(record["entries"], start):
+                self._index_entry(i, entry)
+            return True
+        
+        i = self._id_to_idx.get(record["id"])
+        if i is None:
+            return False
+        if op == "update":
+            updates = record["updates"]
+            _intern_fields(updates)
+            entry = self.entries[i]
+            if updates.keys() & {"id", "file", "hash"}:
+                entry.update(updates)
+                self._reindex()
+            elif updates.keys() & {"type", "qty"}:
+                self._count_entry(entry, -1)
+                entry.update(updates)
+                self._count_entry(entry)
+            else:
+                entry.update(updates)
+        elif op == "delete":
+            del self.entries[i]
+            # Positions after i shift down, and a file/hash may still be held
+            # by another entry, so rebuild rather than patch the indexes
+            self._reindex()
+        return True
+
+    def _commit(self, record: dict[str, Any]) -> bool:
+        """Apply a mutation and append it to the journal."""
+        if not self._apply(record):
+            return False
+        if self._journal_fp is None:
+            self._journal_fp = self.journal_path.open("a", encoding="utf-8", buffering=1 << 20)
+        self._journal_fp.write(_json_dumps(record) + "\n")
+        if not self._batch_depth:
+            self._journal_fp.flush()
+        self._journal_ops += 1
+        if self._journal_ops >= self.COMPACT_THRESHOLD:
+            self.compact()
+        return True
+
+    def flush(self) -> None:
+        """Write buffered journal records and fsync them to disk."""
+        if self._journal_fp is not None:
+            self._journal_fp.flush()
+            os.fsync(self._journal_fp.fileno())
+
+    def compact(self) -> None:
+        """Rewrite the JSON file from memory and drop the journal."""
+        tmp = self._tmp_path()
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(_json_dumps_pretty(self.entries))
+            fh.flush()
+            os.fsync(fh.fileno())
+        if self._journal_fp is not None:
+            self._journal_fp.close()
+            self._journal_fp = None
+        self.journal_path.unlink(missing_ok=True)
+        os.replace(tmp, self.path)
+        self._journal_ops = 0
+
+    def close(self) -> None:
+        """Fold any pending journal records into the JSON file."""
+        if self._journal_ops:
+            self.compact()
+        elif self._journal_fp is not None:
+            self.flush()
+            self._journal_fp.close()
+            self._journal_fp = None
+
+    def _reindex(self) -> None:
+        """Rebuild the file/hash sets, the id -> position map and the stats."""
+        self._files = {e["file"] for e in self.entries if e.get("file")}
+        self._hashes = {e["hash"] for e in self.entries if e.get("hash")}
+        self._id_to_idx: dict[str, int] = {}
+        self._type_counts: dict[str, int] = {}
+        self._total_qty = 0
+        for i, e in enumerate(self.entries):
+            _intern_fields(e)
+            if "id" in e:
+                # First occurrence wins, as with a front-to-back scan
+                self._id_to_idx.setdefault(e["id"], i)
+            self._count_entry(e)
+
+    def _index_entry(self, i: int, entry: dict[str, Any]) -> None:
+        _intern_fields(entry)
+        if entry.get("file"):
+            self._files.add(entry["file"])
+        if entry.get("hash"):
+            self._hashes.add(entry["hash"])
+        if "id" in entry:
+            self._id_to_idx.setdefault(entry["id"], i)
+        self._count_entry(entry)
+
+    def _count_entry(self, entry: dict[str, Any], sign: int = 1) -> None:
+        """Add (or with ``sign=-1`` remove) an entry in the running stats."""
+        component_type = _entry_type(entry)
+        count = self._type_counts.get(component_type, 0) + sign
+        if count:
+            self._type_counts[component_type] = count
+        else:
+            del self._type_counts[component_type]
+        qty_str = entry.get("qty", "0")
+        try:
+            self._total_qty += sign * int(qty_str.replace(" pcs", "").replace(" pc", ""))
+        except (ValueError, AttributeError):
+            pass
 
     def has_file(self, f: str) -> bool:
-        return any(e.get("file") == f for e in self.entries)
+        return f in self._files
 
     def has_hash(self, h: str) -> bool:
-        return any(e.get("hash") == h for e in self.entries)
+        return h in self._hashes
 
     def add(self, entry: dict[str, Any], file: str, h: str) -> bool:
         """Add a new component entry to the database."""
@@ -820,9 +1582,32 @@ class JSONDB:
         entry = entry.copy()
         entry["file"] = file
         entry["hash"] = h
-        self.entries.append(entry)
-        self._save()
-        return True
+        return self._commit({"op": "add", "entry": entry})
+
+    def bulk_add(self, entries: Iterable[tuple[dict[str, Any], str, str]]) -> int:
+        """Add many ``(entry, file, hash)`` triples as one journal record.
+        
+        Entries whose file or hash is already stored (or repeated earlier in
+        the batch) are skipped.
+        
+        Returns:
+            Number of components added
+        """
+        batch = []
+        seen_files: set[str] = set()
+        seen_hashes: set[str] = set()
+        for entry, file, h in entries:
+            if file in seen_files or h in seen_hashes or self.has_file(file) or self.has_hash(h):
+                continue
+            seen_files.add(file)
+            seen_hashes.add(h)
+            entry = entry.copy()
+            entry["file"] = file
+            entry["hash"] = h
+            batch.append(entry)
+        if batch:
+            self._commit({"op": "extend", "entries": batch})
+        return len(batch)
 
     def normalize_type(self, type_str: str) -> str:
         """Normalize component type string."""
@@ -833,26 +1618,43 @@ class JSONDB:
         if not path.exists():
             return
             
-        imported_data = json.loads(path.read_text())
-        components_to_add = parse_jsonld_components(imported_data, path)
+        components_to_add = list(_iter_import_components(path))
         
         # Add all collected components
         if components_to_add:
-            self.entries.extend(components_to_add)
-            self._save()
+            self._commit({"op": "extend", "entries": components_to_add})
 
-    def list_all(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
+    def list_all(
+        self, limit: int | None = None, offset: int = 0, component_type: str | None = None
+    ) -> list[dict[str, Any]]:
         """List all components with optional pagination."""
         start = offset
         end = offset + limit if limit else None
-        return self.entries[start:end]
+        if component_type is None:
+            return self.entries[start:end]
+        wanted = component_type.lower()
+        matches = (e for e in self.entries if str(_entry_type(e)).lower() == wanted)
+        return list(itertools.islice(matches, start, end))
+
+    def list_brief(
+        self, limit: int | None = None, offset: int = 0, component_type: str | None = None
+    ) -> list[tuple[Any, Any, Any, Any]]:
+        """List ``(id, type, value, qty)`` rows with optional pagination."""
+        return [
+            (e.get("id"), e.get("type"), e.get("value"), e.get("qty"))
+            for e in self.list_all(limit, offset, component_type)
+        ]
 
-    def search(self, query: str, field: str | None = None) -> list[dict[str, Any]]:
+    def search(
+        self, query: str, field: str | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
         """Search components by text query."""
         query_lower = query.lower()
         results = []
         
         for entry in self.entries:
+            if limit and len(results) >= limit:
+                break
             if field:
                 # Search in specific field
                 field_value = str(entry.get(field, "")).lower()
@@ -873,66 +1675,59 @@ class JSONDB:
 
     def get_by_id(self, component_id: str) -> dict[str, Any] | None:
         """Get a specific component by ID."""
-        for entry in self.entries:
-            if entry.get("id") == component_id:
-                return entry
-        return None
+        i = self._id_to_idx.get(component_id)
+        return self.entries[i] if i is not None else None
 
     def update(self, component_id: str, updates: dict[str, Any]) -> bool:
         """Update an existing component."""
-        for i, entry in enumerate(self.entries):
-            if entry.get("id") == component_id:
-                self.entries[i].update(updates)
-                self._save()
-                return True
-        return False
+        return self._commit({"op": "update", "id": component_id, "updates": updates})
 
     def delete(self, component_id: str) -> bool:
         """Delete a component from the database."""
-        for i, entry in enumerate(self.entries):
-            if entry.get("id") == component_id:
-                del self.entries[i]
-                self._save()
-                return True
-        return False
+        return self._commit({"op": "delete", "id": component_id})
 
-    def count(self) -> int:
-        """Get total number of components in database."""
-        return len(self.entries)
+    def count(self, component_type: str | None = None) -> int:
+        """Get total number of components, optionally of one type only."""
+        if component_type is None:
+            return len(self.entries)
+        # Answered from the running per-type counts
+        wanted = component_type.lower()
+        return sum(n for t, n in self._type_counts.items() if str(t).lower() == wanted)
 
     def get_stats(self) -> dict[str, Any]:
-        """Get database statistics."""
-        total = len(self.entries)
-        types = {}
-        total_qty = 0
-        
-        for entry in self.entries:
-            # Count by type
-            component_type = entry.get("type", "unknown")
-            types[component_type] = types.get(component_type, 0) + 1
-            
-            # Sum quantities if available
-            qty_str = entry.get("qty", "0")
-            try:
-                qty = int(qty_str.replace(" pcs", "").replace(" pc", ""))
-                total_qty += qty
-            except (ValueError, AttributeError):
-                pass
+        """Get database statistics.
         
+        Counts are maintained as entries are indexed, so this is O(types)
+        rather than a pass over every entry.
+        """
+        types = dict(self._type_counts)
         return {
-            "total_components": total,
-            "total_quantity": total_qty,
+            "total_components": len(self.entries),
+            "total_quantity": self._total_qty,
             "types": types,
             "most_common_type": max(types.items(), key=lambda x: x[1])[0] if types else None
         }
 
 
+def _search_text(*values: Any) -> str:
+    """SQL ``search_text(...)``: the lowercased text ``JSONDB.search`` matches.
+    
+    SQLite's own ``lower()`` and ``LIKE`` only fold ASCII letters.
+    """
+    return " ".join("" if value is None else str(value) for value in values).lower()
+
+
 class SQLiteDB:
     """SQLite database backend for hardware component inventory.
     
     Stores components in a relational database with JSON data column
     for flexibility while maintaining query performance.
     
+    The ``data`` column stays TEXT so SQLite's JSON functions can read it,
+    but it is written and read as raw UTF-8 bytes (``CAST(... AS BLOB)``)
+    so rows go straight to and from the JSON codec without a ``str``
+    round-trip.
+    
     Features:
     - Automatic database initialization
     - Efficient indexing on ID, file, and hash fields
@@ -940,21 +1735,82 @@ class SQLiteDB:
     - Full-text search capabilities
     """
     
-    def __init__(self, path: Path) -> None:
+    # Rows per transaction when streaming a JSON/JSON-LD import
+    IMPORT_BATCH = 5000
+    
+    # Distinct (query, field, limit) searches whose rows are kept in memory
+    SEARCH_CACHE_SIZE = 256
+    
+    # Hot-path statements as fixed strings, so every call hits sqlite3's
+    # prepared-statement cache instead of re-parsing
+    _SQL_HAS_FILE = "SELECT 1 FROM components WHERE file = ? LIMIT 1"
+    _SQL_HAS_HASH = "SELECT 1 FROM components WHERE hash = ? LIMIT 1"
+    _SQL_INSERT = (
+        "INSERT OR IGNORE INTO components (id, file, hash, data) VALUES (?,?,?,CAST(? AS TEXT))"
+    )
+    # Batch form: ? is a JSON array of [id, file, hash, entry] rows; the
+    # entry object is re-serialised by json_extract as compact JSON text
+    _SQL_INSERT_JSON_EACH = (
+        "INSERT OR IGNORE INTO components (id, file, hash, data) "
+        "SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'), "
+        "json_extract(value, '$[2]'), json_extract(value, '$[3]') "
+        "FROM json_each(CAST(? AS TEXT)) ORDER BY key"
+    )
+    _SQL_GET_BY_ID = "SELECT CAST(data AS BLOB) FROM components WHERE id = ?"
+    _SQL_UPDATE_DATA = "UPDATE components SET data = CAST(? AS TEXT) WHERE id = ?"
+    _SQL_DELETE = "DELETE FROM components WHERE id = ?"
+    _SQL_COUNT = "SELECT COUNT(*) FROM components"
+    # Untyped rows are filed under "unknown", as in get_stats
+    _WHERE_TYPE = "WHERE type = ?1 COLLATE NOCASE OR (type IS NULL AND ?1 = 'unknown' COLLATE NOCASE)"
+    _SQL_COUNT_TYPE = f"SELECT COUNT(*) FROM components {_WHERE_TYPE}"
+    _SQL_LIST = "SELECT CAST(data AS BLOB) FROM components LIMIT ? OFFSET ?"
+    _SQL_LIST_TYPE = f"SELECT CAST(data AS BLOB) FROM components {_WHERE_TYPE} LIMIT ?2 OFFSET ?3"
+    # Summary rows straight from the generated columns: no JSON decode
+    _SQL_LIST_BRIEF = "SELECT id, type, value, qty FROM components LIMIT ? OFFSET ?"
+    _SQL_LIST_BRIEF_TYPE = f"SELECT id, type, value, qty FROM components {_WHERE_TYPE} LIMIT ?2 OFFSET ?3"
+    _SQL_SEARCH_FTS = (
+        "SELECT CAST(c.data AS BLOB) FROM components_fts "
+        "JOIN components c ON c.rowid = components_fts.rowid "
+        "WHERE components_fts MATCH ? ORDER BY c.rowid LIMIT ?"
+    )
+    
+    def __init__(self, path: Path | str) -> None:
         """Initialize SQLite database with schema creation.
         
         Args:
-            path: Path to the SQLite database file
+            path: Path to the SQLite database file, or ``":memory:"`` for a
+                throwaway in-RAM database
         """
         self.db_path = str(path)
         
         # Ensure parent directory exists
-        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.db_path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
         
         # Connect and create schema
-        self.conn = sqlite3.connect(path)
+        self.conn = sqlite3.connect(self.db_path, cached_statements=256)
+        self.conn.create_function("search_text", -1, _search_text, deterministic=True)
+        self._stats_cache: tuple[tuple[int, int], dict[str, Any]] | None = None
+        self._search_cache: dict[tuple[str, str | None, int], tuple[bytes, ...]] = {}
+        self._search_version: tuple[int, int] | None = None
+        self._configure()
         self._init_schema()
     
+    def _configure(self) -> None:
+        """Tune the connection for a read-heavy single-writer workload."""
+        if self.db_path != ":memory:":
+            # WAL lets readers (e.g. the MCP server) run alongside a writer;
+            # NORMAL is durable in WAL mode and skips the per-commit fsync
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+    
     def _init_schema(self) -> None:
         """Initialize database schema with proper indexes."""
         # Create main table
@@ -968,171 +1824,391 @@ class SQLiteDB:
             )
         """)
         
-        # Create indexes for efficient queries
-        self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_file ON components(file)"
-        )
+        # UNIQUE indexes let INSERT OR IGNORE do the file/hash dedup in one
+        # statement. Databases that already hold duplicates can't take them,
+        # so keep plain indexes and check in Python there.
+        try:
+            self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_components_file ON components(file)"
+            )
+            self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_components_hash ON components(hash)"
+            )
+        except sqlite3.IntegrityError:
+            self.conn.rollback()
+            self._unique = False
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_file ON components(file)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_hash ON components(hash)"
+            )
+        else:
+            self._unique = True
+            # Superseded by the unique indexes above
+            self.conn.execute("DROP INDEX IF EXISTS idx_file")
+            self.conn.execute("DROP INDEX IF EXISTS idx_hash")
+        
+        self._init_search_columns()
+        self.conn.commit()
+
+    # Searchable fields promoted out of the JSON document as VIRTUAL
+    # generated columns: computed on read, nothing extra stored, but usable
+    # in WHERE/GROUP BY and indexes without decoding rows in Python.
+    _GENERATED_COLUMNS = {
+        "type": "$.type",
+        "value": "$.value",
+        "qty": "$.qty",
+        "description": "$.description",
+        "part_number": "$.partNumber",
+    }
+    # Entry field -> column for the fields ``search`` looks at by default
+    _SEARCH_COLUMNS = {
+        "description": "description",
+        "type": "type",
+        "value": "value",
+        "partNumber": "part_number",
+    }
+
+    def _init_search_columns(self) -> None:
+        """Add generated columns and the trigram full-text index."""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_xinfo(components)")}
+        for column, json_path in self._GENERATED_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(
+                    f"ALTER TABLE components ADD COLUMN {column} "
+                    f"GENERATED ALWAYS AS (json_extract(data, '{json_path}')) VIRTUAL"
+                )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_components_type ON components(type)")
+        # Serves the case-insensitive type filter of list_all/count
         self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_hash ON components(hash)"
+            "CREATE INDEX IF NOT EXISTS idx_components_type_nocase "
+            "ON components(type COLLATE NOCASE)"
         )
         
-        self.conn.commit()
+        # External-content FTS5 table kept in sync by triggers. The trigram
+        # tokenizer gives case-insensitive substring matching, the same
+        # semantics as the old Python ``in`` scan. Needs SQLite >= 3.34.
+        # Rowids of a table without INTEGER PRIMARY KEY may change on VACUUM;
+        # run ``INSERT INTO components_fts(components_fts) VALUES('rebuild')``
+        # afterwards.
+        fts_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'components_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS components_fts USING fts5(
+                    description, type, value, part_number,
+                    content='components', content_rowid='rowid', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS components_fts_ai AFTER INSERT ON components BEGIN
+                    INSERT INTO components_fts(rowid, description, type, value, part_number)
+                    VALUES (new.rowid, new.description, new.type, new.value, new.part_number);
+                END;
+                CREATE TRIGGER IF NOT EXISTS components_fts_ad AFTER DELETE ON components BEGIN
+                    INSERT INTO components_fts(components_fts, rowid, description, type, value, part_number)
+                    VALUES ('delete', old.rowid, old.description, old.type, old.value, old.part_number);
+                END;
+                CREATE TRIGGER IF NOT EXISTS components_fts_au AFTER UPDATE OF data ON components BEGIN
+                    INSERT INTO components_fts(components_fts, rowid, description, type, value, part_number)
+                    VALUES ('delete', old.rowid, old.description, old.type, old.value, old.part_number);
+                    INSERT INTO components_fts(rowid, description, type, value, part_number)
+                    VALUES (new.rowid, new.description, new.type, new.value, new.part_number);
+                END;
+            """)
+        except sqlite3.OperationalError:
+            # FTS5 or the trigram tokenizer isn't compiled in: search falls
+            # back to LIKE over the generated columns
+            self._fts = False
+            return
+        self._fts = True
+        if not fts_exists:
+            # Index rows written before the FTS table existed
+            self.conn.execute("INSERT INTO components_fts(components_fts) VALUES('rebuild')")
 
     def has_file(self, f: str) -> bool:
-        cur = self.conn.execute("SELECT 1 FROM components WHERE file = ? LIMIT 1", (f,))
+        cur = self.conn.execute(self._SQL_HAS_FILE, (f,))
         return cur.fetchone() is not None
 
     def has_hash(self, h: str) -> bool:
-        cur = self.conn.execute("SELECT 1 FROM components WHERE hash = ? LIMIT 1", (h,))
+        cur = self.conn.execute(self._SQL_HAS_HASH, (h,))
         return cur.fetchone() is not None
 
     def add(self, entry: dict[str, Any], file: str, h: str) -> bool:
-        if self.has_file(file) or self.has_hash(h):
-            return False
+        return self.bulk_add([(entry, file, h)]) == 1
+
+    def bulk_add(self, entries: Iterable[tuple[dict[str, Any], str, str]]) -> int:
+        """Insert many ``(entry, file, hash)`` triples in one transaction.
         
-        # Generate ID if not provided
-        component_id = entry.get("id")
-        if not component_id:
-            import uuid
-            component_id = str(uuid.uuid4())[:8]
-            entry = entry.copy()
-            entry["id"] = component_id
+        Entries whose file, hash or id is already stored (or repeated earlier
+        in the batch) are skipped. The batch is committed once, so the
+        ``synchronous=NORMAL`` WAL sync cost is paid per call, not per row.
         
-        self.conn.execute(
-            "INSERT INTO components (id, file, hash, data) VALUES (?,?,?,?)",
-            (component_id, file, h, json.dumps(entry)),
-        )
-        self.conn.commit()
-        return True
+        Returns:
+            Number of components inserted
+        """
+        rows = []
+        seen_files: set[str] = set()
+        seen_hashes: set[str] = set()
+        for entry, file, h in entries:
+            if not self._unique:
+                if file in seen_files or h in seen_hashes or self.has_file(file) or self.has_hash(h):
+                    continue
+                seen_files.add(file)
+                seen_hashes.add(h)
+            
+            # Generate ID if not provided
+            component_id = entry.get("id")
+            if not component_id:
+                import uuid
+                component_id = str(uuid.uuid4())[:8]
+                entry = entry.copy()
+                entry["id"] = component_id
+            
+            rows.append((component_id, file, h, entry))
+        
+        if not rows:
+            return 0
+        
+        with self.conn:
+            if len(rows) > 1:
+                # Ship the whole batch as one JSON array parameter and
+                # let json_each expand it: one statement, one binding
+                cur = self.conn.execute(self._SQL_INSERT_JSON_EACH, (_json_dumps_bytes(rows),))
+            else:
+                component_id, file, h, entry = rows[0]
+                cur = self.conn.execute(
+                    self._SQL_INSERT, (component_id, file, h, _json_dumps_bytes(entry))
+                )
+        # rowcount is sqlite3_changes(), which excludes trigger writes
+        return cur.rowcount
 
     def normalize_type(self, type_str: str) -> str:
         """Normalize component type string."""
         return type_str.lower().strip()
 
     def import_db(self, path: Path) -> None:
-        """Import data from another database file."""
+        """Import data from another database file (JSON, JSON-LD or SQLite)."""
         if not path.exists():
             return
-            
-        imported_data = json.loads(path.read_text())
-        components_to_add = parse_jsonld_components(imported_data, path)
         
-        # Add all collected components
-        for entry in components_to_add:
+        with path.open("rb") as fh:
+            from_sqlite = fh.read(16) == b"SQLite format 3\x00"
+        if from_sqlite:
+            self._import_sqlite(path)
+        else:
+            self._import_rows(path)
+        # A bulk import can change the table's size by orders of magnitude;
+        # refresh the planner statistics so index choices follow
+        self.conn.execute("ANALYZE")
+
+    def _import_rows(self, path: Path) -> None:
+        """Stream components from a JSON or JSON-LD file into the database."""
+        # Components are streamed in and inserted IMPORT_BATCH at a time,
+        # each batch in a single transaction
+        rows = []
+        for entry in _iter_import_components(path):
             # Extract file and hash for SQLite storage
             file_path = entry.pop("file", "")
             hash_val = entry.pop("hash", "")
             if file_path and hash_val:
-                self.add(entry, file_path, hash_val)
-
-    def list_all(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
-        """List all components with optional pagination."""
-        if limit:
-            cur = self.conn.execute(
-                "SELECT data FROM components LIMIT ? OFFSET ?", (limit, offset)
-            )
+                rows.append((entry, file_path, hash_val))
+                if len(rows) >= self.IMPORT_BATCH:
+                    self.bulk_add(rows)
+                    rows = []
+        self.bulk_add(rows)
+
+    def _import_sqlite(self, path: Path) -> None:
+        """Copy components from another inventory database inside SQLite.
+        
+        The source is attached and copied with a single INSERT ... SELECT in
+        one transaction, so rows never pass through Python. Rows whose id,
+        file or hash already exist are skipped.
+        """
+        self.conn.execute("ATTACH DATABASE ? AS src", (str(path),))
+        try:
+            with self.conn:
+                self.conn.execute("""
+                    INSERT OR IGNORE INTO components (id, file, hash, data)
+                    SELECT s.id, s.file, s.hash, s.data FROM src.components AS s
+                    WHERE NOT EXISTS (SELECT 1 FROM main.components c WHERE c.file = s.file)
+                      AND NOT EXISTS (SELECT 1 FROM main.components c WHERE c.hash = s.hash)
+                    ORDER BY s.rowid
+                """)
+        finally:
+            self.conn.execute("DETACH DATABASE src")
+
+    def list_all(
+        self, limit: int | None = None, offset: int = 0, component_type: str | None = None
+    ) -> list[dict[str, Any]]:
+        """List all components with optional pagination.
+        
+        The type filter, limit and offset run in SQL, so only the requested
+        page is decoded.
+        """
+        limit = limit or -1
+        if component_type is None:
+            cur = self.conn.execute(self._SQL_LIST, (limit, offset))
         else:
-            if offset > 0:
-                cur = self.conn.execute("SELECT data FROM components LIMIT -1 OFFSET ?", (offset,))
-            else:
-                cur = self.conn.execute("SELECT data FROM components")
+            cur = self.conn.execute(self._SQL_LIST_TYPE, (component_type, limit, offset))
         
         results = []
         for (data_json,) in cur.fetchall():
-            results.append(json.loads(data_json))
+            results.append(_json_loads(data_json))
         return results
 
-    def search(self, query: str, field: str | None = None) -> list[dict[str, Any]]:
-        """Search components by text query."""
-        # For SQLite, we search in the JSON data field
-        # This is not as efficient as proper columns but maintains flexibility
-        query_lower = query.lower()
-        cur = self.conn.execute("SELECT data FROM components")
-        results = []
+    def list_brief(
+        self, limit: int | None = None, offset: int = 0, component_type: str | None = None
+    ) -> list[tuple[Any, Any, Any, Any]]:
+        """List ``(id, type, value, qty)`` rows with optional pagination.
         
-        for (data_json,) in cur.fetchall():
-            entry = json.loads(data_json)
-            
-            if field:
-                # Search in specific field
-                field_value = str(entry.get(field, "")).lower()
-                if query_lower in field_value:
-                    results.append(entry)
-            else:
-                # Search in all text fields
-                searchable_text = " ".join([
-                    str(entry.get("description", "")),
-                    str(entry.get("type", "")),
-                    str(entry.get("value", "")),
-                    str(entry.get("partNumber", "")),
-                ]).lower()
-                if query_lower in searchable_text:
-                    results.append(entry)
+        Reads the generated columns, so the ``data`` JSON is never decoded.
+        """
+        limit = limit or -1
+        if component_type is None:
+            return self.conn.execute(self._SQL_LIST_BRIEF, (limit, offset)).fetchall()
+        return self.conn.execute(
+            self._SQL_LIST_BRIEF_TYPE, (component_type, limit, offset)
+        ).fetchall()
+
+    def search(
+        self, query: str, field: str | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Search components by text query (case-insensitive substring).
         
-        return results
+        The raw rows of the last ``SEARCH_CACHE_SIZE`` distinct searches are
+        kept until the data changes (see ``get_stats``), so repeated queries
+        skip the FTS/LIKE scan. Each call still decodes fresh dicts, so
+        callers may mutate the results.
+        """
+        if not query:
+            return self.list_all(limit)
+        limit = limit or -1
+        
+        version = self._data_version()
+        if self._search_version != version:
+            self._search_cache.clear()
+            self._search_version = version
+        key = (query, field, limit)
+        rows = self._search_cache.pop(key, None)
+        if rows is None:
+            rows = self._search_rows(query, field, limit)
+            if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+                del self._search_cache[next(iter(self._search_cache))]
+        # (Re)insert at the end so the dict's order is least-recently-used first
+        self._search_cache[key] = rows
+        return [_json_loads(data_json) for data_json in rows]
+    
+    def _search_rows(self, query: str, field: str | None, limit: int) -> tuple[bytes, ...]:
+        """Run a search and return the matching rows' raw JSON."""
+        if field is None and self._fts and len(query) >= 3 and " " not in query:
+            # Quote as an FTS5 string so the whole query is one trigram phrase
+            phrase = '"' + query.replace('"', '""') + '"'
+            cur = self.conn.execute(self._SQL_SEARCH_FTS, (phrase, limit))
+            return tuple(data_json for (data_json,) in cur)
+        
+        # Trigrams can't match queries shorter than three characters, and a
+        # query with a space may span two fields of JSONDB's joined text, so
+        # those (and field-specific searches) scan with search_text() instead
+        params: dict[str, Any] = {"q": query.lower(), "limit": limit}
+        if field is None:
+            where = f"instr(search_text({', '.join(self._SEARCH_COLUMNS.values())}), :q)"
+        elif field in self._SEARCH_COLUMNS:
+            where = f"instr(search_text({self._SEARCH_COLUMNS[field]}), :q)"
+        else:
+            where = "instr(search_text(json_extract(data, :path)), :q)"
+            params["path"] = '$."' + field.replace('"', '""') + '"'
+        
+        cur = self.conn.execute(
+            f"SELECT CAST(data AS BLOB) FROM components WHERE {where} ORDER BY rowid LIMIT :limit",
+            params,
+        )
+        return tuple(data_json for (data_json,) in cur)
 
     def get_by_id(self, component_id: str) -> dict[str, Any] | None:
         """Get a specific component by ID."""
-        cur = self.conn.execute("SELECT data FROM components WHERE id = ?", (component_id,))
+        cur = self.conn.execute(self._SQL_GET_BY_ID, (component_id,))
         row = cur.fetchone()
         if row:
-            return json.loads(row[0])
+            return _json_loads(row[0])
         return None
 
     def update(self, component_id: str, updates: dict[str, Any]) -> bool:
         """Update an existing component."""
-        cur = self.conn.execute("SELECT data FROM components WHERE id = ?", (component_id,))
+        cur = self.conn.execute(self._SQL_GET_BY_ID, (component_id,))
         row = cur.fetchone()
         if not row:
             return False
         
-        entry = json.loads(row[0])
+        entry = _json_loads(row[0])
         entry.update(updates)
         
         self.conn.execute(
-            "UPDATE components SET data = ? WHERE id = ?",
-            (json.dumps(entry), component_id)
+            self._SQL_UPDATE_DATA,
+            (_json_dumps_bytes(entry), component_id)
         )
         self.conn.commit()
         return True
 
     def delete(self, component_id: str) -> bool:
         """Delete a component from the database."""
-        cur = self.conn.execute("DELETE FROM components WHERE id = ?", (component_id,))
+        cur = self.conn.execute(self._SQL_DELETE, (component_id,))
         self.conn.commit()
         return cur.rowcount > 0
 
-    def count(self) -> int:
-        """Get total number of components in database."""
-        cur = self.conn.execute("SELECT COUNT(*) FROM components")
+    def count(self, component_type: str | None = None) -> int:
+        """Get total number of components, optionally of one type only."""
+        if component_type is None:
+            cur = self.conn.execute(self._SQL_COUNT)
+        else:
+            cur = self.conn.execute(self._SQL_COUNT_TYPE, (component_type,))
         return cur.fetchone()[0]
 
+    # Per-type counts and quantity sums in one aggregate pass. Quantities are
+    # string values like "10 pcs": strip the unit and count the rest only if
+    # it is an optionally signed integer, as ``int()`` would accept it.
+    _SQL_STATS = """
+        WITH q AS (
+            SELECT rowid, COALESCE(type, 'unknown') AS t,
+                   CASE WHEN typeof(qty) = 'text'
+                        THEN trim(replace(replace(qty, ' pcs', ''), ' pc', ''), char(32, 9, 10, 13, 11, 12))
+                   END AS v
+            FROM components
+        )
+        SELECT t, COUNT(*),
+               COALESCE(SUM(CASE WHEN ltrim(v, '+-') <> ''
+                                  AND ltrim(v, '+-') NOT GLOB '*[^0-9]*'
+                                  AND length(v) - length(ltrim(v, '+-')) <= 1
+                                 THEN CAST(v AS INTEGER) END), 0)
+        FROM q GROUP BY t ORDER BY MIN(rowid)
+    """
+
+    def _data_version(self) -> tuple[int, int]:
+        """Return a token that changes whenever the stored data may have."""
+        return (self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes)
+    
     def get_stats(self) -> dict[str, Any]:
-        """Get database statistics."""
-        cur = self.conn.execute("SELECT data FROM components")
-        total = 0
-        types = {}
-        total_qty = 0
+        """Get database statistics.
         
-        for (data_json,) in cur.fetchall():
-            total += 1
-            entry = json.loads(data_json)
-            
-            # Count by type
-            component_type = entry.get("type", "unknown")
-            types[component_type] = types.get(component_type, 0) + 1
-            
-            # Sum quantities if available
-            qty_str = entry.get("qty", "0")
-            try:
-                qty = int(qty_str.replace(" pcs", "").replace(" pc", ""))
+        The aggregate is cached until the data changes: ``total_changes``
+        moves on writes through this connection and ``PRAGMA data_version``
+        on commits from any other one, so repeated polling costs two cheap
+        reads instead of a table scan.
+        """
+        version = self._data_version()
+        if self._stats_cache is None or self._stats_cache[0] != version:
+            types = {}
+            total_qty = 0
+            for component_type, count, qty in self.conn.execute(self._SQL_STATS):
+                types[component_type] = count
                 total_qty += qty
-            except (ValueError, AttributeError):
-                pass
-        
-        return {
-            "total_components": total,
-            "total_quantity": total_qty,
-            "types": types,
-            "most_common_type": max(types.items(), key=lambda x: x[1])[0] if types else None
-        }
+            total = sum(types.values())
+            
+            self._stats_cache = (version, {
+                "total_components": total,
+                "total_quantity": total_qty,
+                "types": types,
+                "most_common_type": max(types.items(), key=lambda x: x[1])[0] if types else None
+            })
+        stats = self._stats_cache[1]
+        return {**stats, "types": dict(stats["types"])}
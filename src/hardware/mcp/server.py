@@ -7,7 +7,7 @@ Provides unified access to:
 
 Follows MCP best practices:
 - Async-first tool design
-- Typed parameters and returns using Pydantic
+- Typed parameter and response records (slotted dataclasses)
 - Proper error handling with context
 - Structured output with schemas
 """
@@ -15,14 +15,17 @@ Follows MCP best practices:
 from __future__ import annotations
 
 import asyncio
+import functools
+import json
 import logging
 import os
 import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import httpx
-from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.types import TextContent, Tool
 from mcp.server import Server
@@ -31,6 +34,14 @@ from mcp.server.stdio import stdio_server
 from ..inventory import config as inventory_config
 from ..inventory import utils as inventory_utils
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decode API responses with orjson when installed (the ``fast`` extra)
+_json_loads = orjson.loads if orjson else json.loads
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,97 +53,156 @@ mcp = FastMCP(
     dependencies=["sqlite3", "requests", "rich", "pathlib"],
 )
 
-# Global database instances
-inventory_db: inventory_utils.BaseDB | None = None
+# Shared HTTP client for outbound tool calls (created on first use, closed
+# when the server exits), so repeat requests to the same host reuse pooled
+# keep-alive connections instead of reconnecting each time
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared ``httpx.AsyncClient``, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+        )
+    return _http_client
+
+
+async def _download_to_tempfile(url: str, suffix: str = "") -> Path:
+    """Stream ``url`` into a temporary file and return its path.
+    
+    The body is written in 64 KiB chunks as it arrives, so large downloads
+    are never held in memory. The caller deletes the file.
+    """
+    async with get_http_client().stream("GET", url) as response:
+        response.raise_for_status()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            try:
+                async for chunk in response.aiter_bytes(65536):
+                    tmp.write(chunk)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+    return Path(tmp.name)
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
-# Pydantic models for type-safe tool parameters and responses
+# Internal parameter and response records. Tool input schemas are declared
+# explicitly in TOOLS and outputs are rendered as text, so nothing here is
+# ever validated or serialised by pydantic; plain slotted dataclasses avoid
+# paying for model construction on every call.
 
-class SearchParams(BaseModel):
+@dataclass(slots=True)
+class SearchParams:
     """Parameters for component search."""
-    query: str = Field(description="Search query for components")
-    field: str | None = Field(None, description="Specific field to search in")
-    limit: int = Field(10, description="Maximum number of results", le=50)
+    query: str  # Search query for components
+    field: str | None = None  # Specific field to search in
+    limit: int = 10  # Maximum number of results (<= 50)
 
-class ComponentResult(BaseModel):
+@dataclass(slots=True)
+class ComponentResult:
     """Single component result."""
-    id: str = Field(description="Component ID")
-    type: str = Field(description="Component type")
-    value: str | None = Field(None, description="Component value")
-    quantity: str | None = Field(None, description="Available quantity")
-    description: str | None = Field(None, description="Component description")
-
-class SearchResult(BaseModel):
+    id: str  # Component ID
+    type: str  # Component type
+    value: str | None = None  # Component value
+    quantity: str | None = None  # Available quantity
+    description: str | None = None  # Component description
+
+@dataclass(slots=True)
+class SearchResult:
     """Search results with metadata."""
     components: list[ComponentResult]
-    total_found: int = Field(description="Total number of matching components")
-    query: str = Field(description="Original search query")
+    total_found: int  # Total number of matching components
+    query: str  # Original search query
 
-class StatsResult(BaseModel):
+@dataclass(slots=True)
+class StatsResult:
     """Database statistics."""
     total_components: int
     total_quantity: int
     component_types: dict[str, int]
     most_common_type: str | None
 
-class ListParams(BaseModel):
+@dataclass(slots=True)
+class ListParams:
     """Parameters for listing components."""
-    limit: int = Field(20, description="Maximum number of components", le=100)
-    offset: int = Field(0, description="Number of components to skip", ge=0)
+    limit: int = 20  # Maximum number of components (<= 100)
+    offset: int = 0  # Number of components to skip (>= 0)
 
-class ComponentListResult(BaseModel):
+@dataclass(slots=True)
+class ComponentListResult:
     """List of components with pagination."""
     components: list[ComponentResult]
     limit: int
     offset: int
-    has_more: bool = Field(description="Whether there are more components available")
+    has_more: bool  # Whether there are more components available
 
 # Multimodal tool models
 
-class OCRParams(BaseModel):
+@dataclass(slots=True)
+class OCRParams:
     """Parameters for OCR processing."""
-    url: str | None = Field(None, description="Document URL")
-    file_path: str | None = Field(None, description="Local file path")
-    service: str = Field("mistral", description="OCR service to use")
+    url: str | None = None  # Document URL
+    file_path: str | None = None  # Local file path
+    service: str = "mistral"  # OCR service to use
 
-class OCRResult(BaseModel):
+@dataclass(slots=True)
+class OCRResult:
     """OCR processing result."""
-    text: str = Field(description="Extracted text")
-    components_found: list[ComponentResult] = Field(default_factory=list, description="Parsed components")
-    service_used: str = Field(description="OCR service that was used")
+    text: str  # Extracted text
+    service_used: str  # OCR service that was used
+    components_found: list[ComponentResult] = field(default_factory=list)  # Parsed components
 
-class WebSearchParams(BaseModel):
+@dataclass(slots=True)
+class WebSearchParams:
     """Parameters for web search."""
-    query: str = Field(description="Search query")
-    max_results: int = Field(3, description="Maximum number of results", le=10)
+    query: str  # Search query
+    max_results: int = 3  # Maximum number of results (<= 10)
 
-class WebSearchResult(BaseModel):
+@dataclass(slots=True)
+class WebSearchResult:
     """Web search result."""
     query: str
     results: list[dict[str, Any]]
-    answer: str | None = Field(None, description="Direct answer if available")
+    answer: str | None = None  # Direct answer if available
 
-class EmbeddingParams(BaseModel):
+@dataclass(slots=True)
+class EmbeddingParams:
     """Parameters for text embedding."""
-    texts: list[str] = Field(description="Texts to embed")
+    texts: list[str]  # Texts to embed
 
-class EmbeddingResult(BaseModel):
+@dataclass(slots=True)
+class EmbeddingResult:
     """Embedding result."""
-    embeddings: list[list[float]] = Field(description="Text embeddings")
-    model_used: str = Field(description="Embedding model used")
+    embeddings: list[list[float]]  # Text embeddings
+    model_used: str  # Embedding model used
 
-class ConvertParams(BaseModel):
+@dataclass(slots=True)
+class ConvertParams:
     """Parameters for document conversion."""
-    url: str | None = Field(None, description="Document URL")
-    file_path: str | None = Field(None, description="Local file path")
-    from_format: str | None = Field(None, description="Source format")
-    to_format: str = Field("markdown", description="Target format")
+    url: str | None = None  # Document URL
+    file_path: str | None = None  # Local file path
+    from_format: str | None = None  # Source format
+    to_format: str = "markdown"  # Target format
 
-class ConvertResult(BaseModel):
+@dataclass(slots=True)
+class ConvertResult:
     """Document conversion result."""
-    content: str = Field(description="Converted content")
-    from_format: str = Field(description="Source format")
-    to_format: str = Field(description="Target format")
+    content: str  # Converted content
+    from_format: str  # Source format
+    to_format: str  # Target format
 
 
 def initialize_inventory_db() -> inventory_utils.BaseDB:
@@ -147,8 +217,28 @@ def initialize_inventory_db() -> inventory_utils.BaseDB:
         raise RuntimeError("Could not resolve inventory database path")
 
 
-# Define MCP tools
-TOOLS = [
+@functools.cache
+def get_inventory_db() -> inventory_utils.BaseDB:
+    """Return the shared inventory database, opening it on first use.
+    
+    A failed open raises and is not cached, so the next call retries.
+    """
+    return initialize_inventory_db()
+
+
+def close_inventory_db() -> None:
+    """Close the shared inventory database, if one was opened.
+    
+    For a JSON inventory this folds the journal back into the JSON file.
+    """
+    if get_inventory_db.cache_info().currsize:
+        get_inventory_db().close()
+        get_inventory_db.cache_clear()
+
+
+# Define MCP tools. Built (and schema-validated by pydantic) once at import;
+# kept as a tuple so the shared definitions can't be mutated between calls.
+TOOLS: tuple[Tool, ...] = (
     # Inventory tools
     Tool(
         name="inventory_search",
@@ -313,27 +403,22 @@ TOOLS = [
                 }
             }
         }
-    )
-]
+    ),
+)
 
 
 # Tool handlers - Inventory
 async def handle_inventory_search(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle component search requests."""
-    global inventory_db
-    if not inventory_db:
-        inventory_db = initialize_inventory_db()
+    inventory_db = get_inventory_db()
     
     query = arguments.get("query", "")
     field = arguments.get("field")
     limit = arguments.get("limit", 10)
     
     try:
-        results = inventory_db.search(query, field)
-        
-        # Limit results
-        if limit and len(results) > limit:
-            results = results[:limit]
+        # The limit is applied by the backend, so only that many rows are read
+        results = inventory_db.search(query, field, limit=limit)
         
         if not results:
             return [TextContent(
@@ -342,7 +427,7 @@ async def handle_inventory_search(arguments: dict[str, Any]) -> list[TextContent
             )]
         
         # Format results
-        response_text = f"Found {len(results)} component(s) matching '{query}':\n\n"
+        parts = [f"Found {len(results)} component(s) matching '{query}':\n\n"]
         
         for i, component in enumerate(results, 1):
             comp_id = component.get("id", "unknown")[:8]
@@ -350,17 +435,21 @@ async def handle_inventory_search(arguments: dict[str, Any]) -> list[TextContent
             value = component.get("value", "N/A")
             qty = component.get("qty", "N/A")
             desc = component.get("description", "N/A")
+            if len(desc) > 100:
+                desc = desc[:100] + "..."
             
-            response_text += f"{i}. ID: {comp_id}\n"
-            response_text += f"   Type: {comp_type}\n"
-            response_text += f"   Value: {value}\n"
-            response_text += f"   Quantity: {qty}\n"
-            response_text += f"   Description: {desc[:100]}{'...' if len(desc) > 100 else ''}\n\n"
+            parts.append(
+                f"{i}. ID: {comp_id}\n"
+                f"   Type: {comp_type}\n"
+                f"   Value: {value}\n"
+                f"   Quantity: {qty}\n"
+                f"   Description: {desc}\n\n"
+            )
         
-        return [TextContent(type="text", text=response_text)]
+        return [TextContent(type="text", text="".join(parts))]
         
     except Exception as e:
-        logger.error(f"Error searching components: {e}")
+        logger.error("Error searching components: %s", e)
         return [TextContent(
             type="text", 
             text=f"Error searching components: {str(e)}"
@@ -369,9 +458,7 @@ async def handle_inventory_search(arguments: dict[str, Any]) -> list[TextContent
 
 async def handle_inventory_get_component(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle get component by ID requests."""
-    global inventory_db
-    if not inventory_db:
-        inventory_db = initialize_inventory_db()
+    inventory_db = get_inventory_db()
     
     component_id = arguments.get("component_id", "")
     
@@ -385,16 +472,17 @@ async def handle_inventory_get_component(arguments: dict[str, Any]) -> list[Text
             )]
         
         # Format component details
-        response_text = f"Component Details (ID: {component_id}):\n\n"
-        
-        for key, value in component.items():
-            if key not in ["file", "hash"]:  # Hide internal fields
-                response_text += f"{key.capitalize()}: {value}\n"
+        parts = [f"Component Details (ID: {component_id}):\n\n"]
+        parts.extend(
+            f"{key.capitalize()}: {value}\n"
+            for key, value in component.items()
+            if key not in ("file", "hash")  # Hide internal fields
+        )
         
-        return [TextContent(type="text", text=response_text)]
+        return [TextContent(type="text", text="".join(parts))]
         
     except Exception as e:
-        logger.error(f"Error getting component: {e}")
+        logger.error("Error getting component: %s", e)
         return [TextContent(
             type="text",
             text=f"Error getting component: {str(e)}"
@@ -403,28 +491,18 @@ async def handle_inventory_get_component(arguments: dict[str, Any]) -> list[Text
 
 async def handle_inventory_list(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle list components requests."""
-    global inventory_db
-    if not inventory_db:
-        inventory_db = initialize_inventory_db()
+    inventory_db = get_inventory_db()
     
     limit = arguments.get("limit", 20)
     offset = arguments.get("offset", 0)
     component_type = arguments.get("component_type")
     
     try:
-        # Get all components first
-        all_components = inventory_db.list_all(limit=None, offset=0)
-        
-        # Filter by type if specified
-        if component_type:
-            all_components = [
-                c for c in all_components 
-                if c.get("type", "").lower() == component_type.lower()
-            ]
-        
-        # Apply pagination
-        total = len(all_components)
-        components = all_components[offset:offset + limit] if limit else all_components[offset:]
+        # Filtering and pagination run in the backend: only the requested
+        # page is materialised
+        component_type = component_type or None
+        total = inventory_db.count(component_type)
+        components = inventory_db.list_brief(limit=limit, offset=offset, component_type=component_type)
         
         if not components:
             return [TextContent(
@@ -434,21 +512,24 @@ async def handle_inventory_list(arguments: dict[str, Any]) -> list[TextContent]:
         
         # Format results
         filter_text = f" (filtered by type: {component_type})" if component_type else ""
-        response_text = f"Components in inventory{filter_text}:\n"
-        response_text += f"Showing {len(components)} of {total} total components\n\n"
-        
-        for i, component in enumerate(components, offset + 1):
-            comp_id = component.get("id", "unknown")[:8]
-            comp_type = component.get("type", "unknown")
-            value = component.get("value", "N/A")
-            qty = component.get("qty", "N/A")
+        parts = [
+            f"Components in inventory{filter_text}:\n",
+            f"Showing {len(components)} of {total} total components\n\n",
+        ]
+        
+        # Rows are (id, type, value, qty) tuples; None marks a missing field
+        for i, (comp_id, comp_type, value, qty) in enumerate(components, offset + 1):
+            comp_id = "unknown" if comp_id is None else comp_id[:8]
+            comp_type = "unknown" if comp_type is None else comp_type
+            value = "N/A" if value is None else value
+            qty = "N/A" if qty is None else qty
             
-            response_text += f"{i}. {comp_id} - {comp_type} {value} ({qty})\n"
+            parts.append(f"{i}. {comp_id} - {comp_type} {value} ({qty})\n")
         
-        return [TextContent(type="text", text=response_text)]
+        return [TextContent(type="text", text="".join(parts))]
         
     except Exception as e:
-        logger.error(f"Error listing components: {e}")
+        logger.error("Error listing components: %s", e)
         return [TextContent(
             type="text",
             text=f"Error listing components: {str(e)}"
@@ -457,38 +538,39 @@ async def handle_inventory_list(arguments: dict[str, Any]) -> list[TextContent]:
 
 async def handle_inventory_stats(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle inventory statistics requests."""
-    global inventory_db
-    if not inventory_db:
-        inventory_db = initialize_inventory_db()
+    inventory_db = get_inventory_db()
     
     try:
         stats = inventory_db.get_stats()
         
-        response_text = "Inventory Statistics:\n\n"
-        response_text += f"Total components: {stats['total_components']}\n"
-        response_text += f"Total quantity: {stats['total_quantity']}\n"
+        parts = [
+            "Inventory Statistics:\n\n",
+            f"Total components: {stats['total_components']}\n",
+            f"Total quantity: {stats['total_quantity']}\n",
+        ]
         
         if stats.get('most_common_type'):
-            response_text += f"Most common type: {stats['most_common_type']}\n"
+            parts.append(f"Most common type: {stats['most_common_type']}\n")
         
         if stats.get('types'):
-            response_text += "\nComponents by type:\n"
-            for comp_type, count in sorted(stats['types'].items(), key=lambda x: x[1], reverse=True):
-                response_text += f"  {comp_type}: {count}\n"
+            parts.append("\nComponents by type:\n")
+            parts.extend(
+                f"  {comp_type}: {count}\n"
+                for comp_type, count in sorted(stats['types'].items(), key=lambda x: x[1], reverse=True)
+            )
         
-        return [TextContent(type="text", text=response_text)]
+        return [TextContent(type="text", text="".join(parts))]
         
     except Exception as e:
-        logger.error(f"Error getting stats: {e}")
+        logger.error("Error getting stats: %s", e)
         return [TextContent(
             type="text",
             text=f"Error getting inventory stats: {str(e)}"
         )]
 
 
-async def handle_system_info(arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle system information requests."""
-    response_text = """Hardware Management System Information:
+# The system_info reply is static, so its TextContent is built once
+_SYSTEM_INFO_RESPONSE = (TextContent(type="text", text="""Hardware Management System Information:
 
 Available Modules:
 • inventory - Component management with OCR extraction and CRUD operations
@@ -510,9 +592,12 @@ Database Location:
 • Fallback: $XDG_DATA_HOME/hardware/inventory-main.db
 
 Use the inventory_* tools to interact with the component database.
-"""
-    
-    return [TextContent(type="text", text=response_text)]
+"""),)
+
+
+async def handle_system_info(arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle system information requests."""
+    return list(_SYSTEM_INFO_RESPONSE)
 
 
 # Multimodal tool handlers
@@ -532,17 +617,15 @@ async def handle_ocr_process(arguments: dict[str, Any]) -> list[TextContent]:
             path = Path(file_path)
         else:
             # Download file from URL
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                # Save to temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-                    tmp.write(response.content)
-                    path = Path(tmp.name)
-        
-        # Extract text using existing OCR system
-        text = inventory_utils.ocr_extract(path, service)
+            path = await _download_to_tempfile(url, suffix=".png")
+        
+        # Extract text using existing OCR system, off the event loop so other
+        # tool calls keep being served while the provider responds
+        try:
+            text = await inventory_utils.ocr_extract_async(path, service)
+        finally:
+            if not file_path:
+                path.unlink(missing_ok=True)
         
         # Parse for components
         parsed_fields = inventory_utils.parse_fields(text)
@@ -557,15 +640,16 @@ async def handle_ocr_process(arguments: dict[str, Any]) -> list[TextContent]:
             )
             components_found.append(component)
         
-        result_text = f"OCR Text (using {service}):\n{text}\n\n"
+        parts = [f"OCR Text (using {service}):\n{text}\n\n"]
         if components_found:
-            result_text += f"Components detected: {len(components_found)}\n"
-            for comp in components_found:
-                result_text += f"- {comp.type}: {comp.value} ({comp.quantity})\n"
+            parts.append(f"Components detected: {len(components_found)}\n")
+            parts.extend(
+                f"- {comp.type}: {comp.value} ({comp.quantity})\n" for comp in components_found
+            )
         else:
-            result_text += "No components detected in the text"
+            parts.append("No components detected in the text")
         
-        return [TextContent(type="text", text=result_text)]
+        return [TextContent(type="text", text="".join(parts))]
         
     except Exception as e:
         return [TextContent(type="text", text=f"OCR processing failed: {str(e)}")]
@@ -590,11 +674,10 @@ async def handle_web_search(arguments: dict[str, Any]) -> list[TextContent]:
             "include_raw_content": False
         }
         
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post("https://api.tavily.com/search", json=payload)
-            response.raise_for_status()
-            
-        data = response.json()
+        response = await get_http_client().post("https://api.tavily.com/search", json=payload)
+        response.raise_for_status()
+        
+        data = _json_loads(response.content)
         
         result_lines = [f"Web search results for: {query}\n"]
         
@@ -602,10 +685,12 @@ async def handle_web_search(arguments: dict[str, Any]) -> list[TextContent]:
             result_lines.append(f"Answer: {answer}\n")
         
         for i, result in enumerate(data.get("results", [])[:max_results], 1):
-            title = result.get("title", "No title")
-            content = result.get("content", "")[:150] + "..." if len(result.get("content", "")) > 150 else result.get("content", "")
-            url = result.get("url", "")
-            result_lines.append(f"{i}. {title}\n{content}\n{url}\n")
+            content = result.get("content") or ""
+            if len(content) > 150:
+                content = content[:150] + "..."
+            result_lines.append(
+                f"{i}. {result.get('title', 'No title')}\n{content}\n{result.get('url', '')}\n"
+            )
         
         return [TextContent(type="text", text="\n".join(result_lines))]
         
@@ -613,6 +698,45 @@ async def handle_web_search(arguments: dict[str, Any]) -> list[TextContent]:
         return [TextContent(type="text", text=f"Web search failed: {str(e)}")]
 
 
+@functools.lru_cache(maxsize=1)
+def _get_st_model(name: str = "all-MiniLM-L6-v2"):
+    """Load the local embedding model once and keep it resident."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+# Texts per Jina request, and how many of those requests may be in flight
+_JINA_BATCH = 64
+_JINA_CONCURRENCY = 4
+
+
+async def _jina_embed(texts: list[str], api_key: str) -> list[list[float]]:
+    """Embed ``texts`` with Jina, in order.
+    
+    Large inputs are split into ``_JINA_BATCH``-sized requests that run
+    concurrently (at most ``_JINA_CONCURRENCY`` at a time) so no single
+    payload hits the API's size limits and round trips overlap.
+    """
+    client = get_http_client()
+    headers = {"Authorization": f"Bearer {api_key}"}
+    semaphore = asyncio.Semaphore(_JINA_CONCURRENCY)
+    
+    async def embed_batch(batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            response = await client.post(
+                "https://api.jina.ai/v1/embeddings",
+                headers=headers,
+                json={"model": "jina-embeddings-v2-base-en", "input": batch}
+            )
+        response.raise_for_status()
+        return [item["embedding"] for item in _json_loads(response.content)["data"]]
+    
+    batches = await asyncio.gather(*(
+        embed_batch(texts[i:i + _JINA_BATCH]) for i in range(0, len(texts), _JINA_BATCH)
+    ))
+    return [embedding for batch in batches for embedding in batch]
+
+
 async def handle_text_embedding(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle text embedding requests."""
     texts = arguments.get("texts", [])
@@ -626,33 +750,28 @@ async def handle_text_embedding(arguments: dict[str, Any]) -> list[TextContent]:
     try:
         if jina_api_key:
             # Use Jina AI embeddings
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.jina.ai/v1/embeddings",
-                    headers={"Authorization": f"Bearer {jina_api_key}"},
-                    json={"model": "jina-embeddings-v2-base-en", "input": texts}
-                )
-                response.raise_for_status()
-                
-            data = response.json()
-            embeddings = [item["embedding"] for item in data["data"]]
+            embeddings = await _jina_embed(texts, jina_api_key)
             model_used = "jina-embeddings-v2-base-en"
             
         else:
             # Fallback to local embeddings
             try:
-                from sentence_transformers import SentenceTransformer
-                model = SentenceTransformer("all-MiniLM-L6-v2")
-                embeddings = model.encode(texts).tolist()
+                # Loading and encoding are CPU-bound: keep them off the event
+                # loop. The ndarray is only summarised below, so it is not
+                # converted to nested lists
+                model = await asyncio.to_thread(_get_st_model)
+                embeddings = await asyncio.to_thread(
+                    model.encode, texts, batch_size=64, convert_to_numpy=True
+                )
                 model_used = "all-MiniLM-L6-v2 (local)"
             except ImportError:
                 return [TextContent(type="text", text="No JINA_API_KEY found and sentence-transformers not installed")]
         
         result_text = f"Generated embeddings for {len(texts)} texts using {model_used}\n"
-        result_text += f"Embedding dimensions: {len(embeddings[0]) if embeddings else 0}\n"
+        result_text += f"Embedding dimensions: {len(embeddings[0]) if len(embeddings) else 0}\n"
         
         # Include first few values for verification
-        if embeddings:
+        if len(embeddings):
             result_text += f"First embedding preview: [{', '.join(f'{x:.4f}' for x in embeddings[0][:5])}...]\n"
         
         return [TextContent(type="text", text=result_text)]
@@ -661,6 +780,10 @@ async def handle_text_embedding(arguments: dict[str, Any]) -> list[TextContent]:
         return [TextContent(type="text", text=f"Embedding generation failed: {str(e)}")]
 
 
+# Pandoc input formats that are plain text and can be converted in memory
+_TEXT_FORMATS = frozenset({"markdown", "commonmark", "gfm", "html", "rst", "latex", "org", "textile"})
+
+
 async def handle_convert_document(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle document conversion requests."""
     url = arguments.get("url")
@@ -672,40 +795,44 @@ async def handle_convert_document(arguments: dict[str, Any]) -> list[TextContent
         return [TextContent(type="text", text="Either url or file_path is required")]
     
     try:
-        # Get file content
+        # Local files are converted in place. Downloads of a known text
+        # format are piped straight to pandoc; anything else is streamed to
+        # a temp file rather than buffered in memory
+        text_source = not file_path and from_format in _TEXT_FORMATS
         if file_path:
-            content = Path(file_path).read_bytes()
+            path = Path(file_path)
+        elif text_source:
+            response = await get_http_client().get(url)
+            response.raise_for_status()
+            source_text = response.text
         else:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                content = response.content
+            path = await _download_to_tempfile(url)
         
         # Use pandoc for conversion
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(content)
-            tmp.flush()
-            
-            try:
-                import pypandoc
+        try:
+            import pypandoc
+            if text_source:
+                converted = pypandoc.convert_text(source_text, to=to_format, format=from_format)
+            else:
                 converted = pypandoc.convert_file(
-                    tmp.name,
+                    str(path),
                     to=to_format,
                     format=from_format
                 )
-                
-                # Truncate to 4KB limit
-                if len(converted) > 4000:
-                    converted = converted[:4000] + "\n... (truncated)"
-                
-                result_text = f"Document converted to {to_format}:\n\n{converted}"
-                
-            except ImportError:
-                result_text = "pypandoc not installed. Install with: pip install pypandoc"
-            except Exception as e:
-                result_text = f"Conversion failed: {str(e)}"
-            finally:
-                os.unlink(tmp.name)
+            
+            # Truncate to 4KB limit
+            if len(converted) > 4000:
+                converted = converted[:4000] + "\n... (truncated)"
+            
+            result_text = f"Document converted to {to_format}:\n\n{converted}"
+            
+        except ImportError:
+            result_text = "pypandoc not installed. Install with: pip install pypandoc"
+        except Exception as e:
+            result_text = f"Conversion failed: {str(e)}"
+        finally:
+            if not file_path and not text_source:
+                path.unlink(missing_ok=True)
         
         return [TextContent(type="text", text=result_text)]
         
@@ -713,8 +840,8 @@ async def handle_convert_document(arguments: dict[str, Any]) -> list[TextContent
         return [TextContent(type="text", text=f"Document conversion failed: {str(e)}")]
 
 
-# Tool dispatch map
-TOOL_HANDLERS = {
+# Tool dispatch map (read-only)
+TOOL_HANDLERS = MappingProxyType({
     "inventory_search": handle_inventory_search,
     "inventory_get_component": handle_inventory_get_component,
     "inventory_list": handle_inventory_list,
@@ -725,7 +852,9 @@ TOOL_HANDLERS = {
     "web_search": handle_web_search,
     "text_embedding": handle_text_embedding,
     "convert_document": handle_convert_document,
-}
+})
+
+_AVAILABLE_TOOLS = ", ".join(TOOL_HANDLERS)
 
 
 async def main():
@@ -735,22 +864,27 @@ async def main():
     @server.list_tools()
     async def list_tools() -> list[Tool]:
         """List available tools."""
-        return TOOLS
+        return list(TOOLS)
     
     @server.call_tool()
     async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle tool calls."""
-        if name not in TOOL_HANDLERS:
+        handler = TOOL_HANDLERS.get(name)
+        if handler is None:
             return [TextContent(
                 type="text",
-                text=f"Unknown tool: {name}. Available tools: {', '.join(TOOL_HANDLERS.keys())}"
+                text=f"Unknown tool: {name}. Available tools: {_AVAILABLE_TOOLS}"
             )]
         
-        return await TOOL_HANDLERS[name](arguments)
+        return await handler(arguments)
     
     # Run the server
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await close_http_client()
+        close_inventory_db()
 
 
 def run_server():
@@ -2,3 +2,11 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_ocr_cache(tmp_path, monkeypatch):
+    """Keep OCR results out of the user's cache and independent between tests."""
+    monkeypatch.setenv("HARDWARE_OCR_CACHE_DIR", str(tmp_path / "ocr-cache"))
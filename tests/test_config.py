@@ -40,3 +40,9 @@ jsonld_path = 'cwd.json'
     (cwd / "cfg.toml").unlink()
     s, j = config.resolve_db_paths(None, None, cwd=cwd, home=home)
     assert s == "home.db" and j == "home.json"
+
+
+def test_load_toml_missing_file(tmp_path):
+    assert config._load_toml(tmp_path / "absent.toml") == {}
+    (tmp_path / "cfg.toml").write_text("[main]\nservice = 'openai'\n")
+    assert config._load_toml(tmp_path / "cfg.toml") == {"main": {"service": "openai"}}
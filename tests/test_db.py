@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from hardware.inventory.utils import JSONDB, SQLiteDB
 
 
@@ -29,3 +33,480 @@ def test_sqlite_db(tmp_path):
     db2 = SQLiteDB(path)
     assert db2.has_file("f1")
     assert db2.has_hash("h2")
+
+
+def test_sqlite_db_in_memory():
+    db = SQLiteDB(":memory:")
+    _run_backend_tests(db)
+    assert db.count() == 2
+    db.close()
+
+
+def test_sqlite_bulk_add(tmp_path):
+    db = SQLiteDB(tmp_path / "db.sqlite")
+    assert db.add({"name": "c0"}, "f0", "h0")
+    inserted = db.bulk_add([
+        ({"name": "c1"}, "f1", "h1"),
+        ({"name": "dup-file"}, "f1", "hx"),
+        ({"name": "dup-hash"}, "fx", "h1"),
+        ({"name": "existing"}, "f0", "hy"),
+        ({"name": "c2"}, "f2", "h2"),
+    ])
+    assert inserted == 2
+    assert db.count() == 3
+    assert db.bulk_add([]) == 0
+    # bulk inserts never relax durability below NORMAL
+    assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_json_bulk_add_writes_one_record(tmp_path):
+    db = JSONDB(tmp_path / "db.json")
+    assert db.add({"name": "c0"}, "f0", "h0")
+    inserted = db.bulk_add([
+        ({"name": "c1"}, "f1", "h1"),
+        ({"name": "dup-file"}, "f1", "hx"),
+        ({"name": "existing"}, "f0", "hy"),
+        ({"name": "c2"}, "f2", "h2"),
+    ])
+    assert inserted == 2
+    assert db.bulk_add([]) == 0
+    assert len(db.journal_path.read_text().splitlines()) == 2
+    assert [e["name"] for e in JSONDB(tmp_path / "db.json").entries] == ["c0", "c1", "c2"]
+
+
+def test_sqlite_wal_and_unique_index(tmp_path):
+    db = SQLiteDB(tmp_path / "db.sqlite")
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT 1 FROM components WHERE file = ? LIMIT 1", ("f",)
+    ).fetchall()
+    assert "idx_components_file" in plan[0][-1]
+
+
+def test_sqlite_legacy_duplicates_fall_back(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "legacy.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE components (id TEXT PRIMARY KEY, file TEXT, hash TEXT, "
+        "data TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.executemany(
+        "INSERT INTO components (id, file, hash, data) VALUES (?,?,?,?)",
+        [("a", "f", "h", "{}"), ("b", "f", "h", "{}")],
+    )
+    conn.commit()
+    conn.close()
+
+    db = SQLiteDB(path)
+    assert not db._unique
+    assert not db.add({"name": "dup"}, "f", "h2")
+    assert db.add({"name": "new"}, "f2", "h2")
+
+
+def test_json_db_indexes_track_mutations(tmp_path):
+    db = JSONDB(tmp_path / "db.json")
+    db.add({"id": "a", "name": "c1"}, "f1", "h1")
+    db.add({"id": "b", "name": "c2"}, "f2", "h2")
+    assert db.get_by_id("b")["name"] == "c2"
+
+    assert db.delete("a")
+    assert not db.has_file("f1")
+    assert db.get_by_id("b")["name"] == "c2"
+
+    assert db.update("b", {"id": "c"})
+    assert db.get_by_id("b") is None
+    assert db.get_by_id("c")["name"] == "c2"
+    assert not db.update("missing", {"name": "x"})
+
+
+def test_json_db_journal_replay_and_compact(tmp_path):
+    import json
+
+    path = tmp_path / "db.json"
+    db = JSONDB(path)
+    db.add({"id": "a"}, "f1", "h1")
+    db.add({"id": "b"}, "f2", "h2")
+    db.update("a", {"qty": "3"})
+    db.delete("b")
+
+    # Mutations are journaled, the snapshot is untouched until compaction
+    assert json.loads(path.read_text()) == []
+    assert len(db.journal_path.read_text().splitlines()) == 4
+
+    reopened = JSONDB(path)
+    assert reopened.count() == 1
+    assert reopened.get_by_id("a")["qty"] == "3"
+    assert not reopened.has_file("f2")
+
+    db.close()
+    assert not db.journal_path.exists()
+    assert [e["id"] for e in json.loads(path.read_text())] == ["a"]
+
+
+def test_cli_commands_leave_json_file_current(tmp_path, monkeypatch):
+    import json
+
+    from hardware.inventory import cli, config
+
+    path = tmp_path / "inv.jsonld"
+    with JSONDB(path) as db:
+        db.add({"id": "a", "type": "resistor"}, "f1", "h1")
+        db.add({"id": "b", "type": "diode"}, "f2", "h2")
+    monkeypatch.setattr(config, "resolve_db_paths", lambda: (None, str(path)))
+
+    cli.main(["update", "a", "--set", "qty=7"])
+    cli.main(["delete", "b", "--force"])
+
+    assert json.loads(path.read_text()) == [
+        {"id": "a", "type": "resistor", "file": "f1", "hash": "h1", "qty": "7"}
+    ]
+    assert not path.with_name(path.name + ".journal").exists()
+
+
+def test_json_db_interns_low_cardinality_fields(tmp_path):
+    path = tmp_path / "db.json"
+    # Build the strings at runtime so the compiler can't share constants
+    path.write_text(json.dumps([
+        {"id": "a", "type": "".join(["resis", "tor"]), "package": "".join(["TO", "-92"])},
+    ]))
+    db = JSONDB(path)
+    db.add({"id": "b", "type": "".join(["resi", "stor"]), "package": "TO-92"}, "f", "h")
+    db.update("a", {"package": "".join(["TO-", "92"])})
+    a, b = db.entries
+    assert a["type"] is b["type"]
+    assert a["package"] is b["package"]
+
+
+def test_json_db_torn_journal_line(tmp_path):
+    path = tmp_path / "db.json"
+    db = JSONDB(path)
+    db.add({"id": "a"}, "f1", "h1")
+    db.close()
+    with open(db.journal_path, "w") as fh:
+        fh.write('{"op": "add", "entry": {"id": "b", "file": "f2", "hash": "h2"}}\n{"op": "ad')
+
+    db = JSONDB(path)
+    assert [e["id"] for e in db.list_all()] == ["a", "b"]
+    assert not db.journal_path.exists()
+
+
+def test_json_db_compact_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(JSONDB, "COMPACT_THRESHOLD", 3)
+    db = JSONDB(tmp_path / "db.json")
+    for i in range(4):
+        db.add({"id": str(i)}, f"f{i}", f"h{i}")
+    assert len(db.journal_path.read_text().splitlines()) == 1
+    assert JSONDB(tmp_path / "db.json").count() == 4
+
+
+def test_sqlite_data_stored_as_json_text(tmp_path):
+    db = SQLiteDB(tmp_path / "db.sqlite")
+    db.add({"id": "a", "type": "résistor"}, "f1", "h1")
+    row = db.conn.execute(
+        "SELECT typeof(data), json_extract(data, '$.type') FROM components"
+    ).fetchone()
+    assert row == ("text", "résistor")
+    assert db.get_by_id("a")["type"] == "résistor"
+    assert db.update("a", {"qty": "5"})
+    assert db.list_all()[0]["qty"] == "5"
+
+
+def test_sqlite_search_uses_promoted_columns(tmp_path):
+    db = SQLiteDB(tmp_path / "db.sqlite")
+    db.add({"id": "r1", "type": "resistor", "value": "10kΩ", "description": "Carbon film"}, "f1", "h1")
+    db.add({"id": "c1", "type": "capacitor", "value": "100uF", "partNumber": "EEU-FR1C101"}, "f2", "h2")
+    db.add({"id": "x1", "type": "ic", "notes": "50%_off"}, "f3", "h3")
+
+    assert [e["id"] for e in db.search("CARBON")] == ["r1"]
+    assert [e["id"] for e in db.search("fr1c")] == ["c1"]
+    # Short queries fall back to LIKE
+    assert [e["id"] for e in db.search("uF")] == ["c1"]
+    assert [e["id"] for e in db.search("ic")] == ["x1"]
+    # Field searches, including fields that aren't promoted columns
+    assert [e["id"] for e in db.search("10k", field="value")] == ["r1"]
+    assert [e["id"] for e in db.search("%_", field="notes")] == ["x1"]
+    assert db.search("%") == []
+
+    # The full-text index follows updates and deletes
+    db.update("r1", {"description": "Metal film"})
+    assert db.search("carbon") == []
+    assert [e["id"] for e in db.search("metal")] == ["r1"]
+    db.delete("c1")
+    assert db.search("fr1c") == []
+
+    assert db.get_stats()["types"] == {"resistor": 1, "ic": 1}
+
+
+def test_sqlite_search_index_built_for_existing_rows(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "legacy.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE components (id TEXT PRIMARY KEY, file TEXT, hash TEXT, "
+        "data TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.execute(
+        "INSERT INTO components (id, file, hash, data) VALUES (?,?,?,?)",
+        ("a", "f", "h", '{"id": "a", "description": "Ceramic disc"}'),
+    )
+    conn.commit()
+    conn.close()
+
+    db = SQLiteDB(path)
+    assert [e["id"] for e in db.search("ceramic")] == ["a"]
+
+
+def test_sqlite_stats_quantity_parsing():
+    db = SQLiteDB(":memory:")
+    rows = [
+        ({"type": "resistor", "qty": "10 pcs"}, 10),
+        ({"type": "resistor", "qty": " 5 "}, 5),
+        ({"type": "capacitor", "qty": "1 pc"}, 1),
+        ({"type": "capacitor", "qty": "-2"}, -2),
+        ({"type": "capacitor", "qty": "12abc"}, 0),
+        ({"type": "capacitor", "qty": "+-3"}, 0),
+        ({"type": "ic", "qty": 7}, 0),
+        ({"qty": "pcs"}, 0),
+    ]
+    for i, (entry, _) in enumerate(rows):
+        db.add(dict(entry, id=str(i)), f"f{i}", f"h{i}")
+
+    stats = db.get_stats()
+    assert stats["total_quantity"] == sum(q for _, q in rows)
+    assert stats["types"] == {"resistor": 2, "capacitor": 4, "ic": 1, "unknown": 1}
+    assert stats["most_common_type"] == "capacitor"
+
+
+def test_json_stats_follow_mutations(tmp_path):
+    db = JSONDB(tmp_path / "db.json")
+    db.add({"id": "a", "type": "resistor", "qty": "10 pcs"}, "fa", "ha")
+    db.add({"id": "b", "type": "resistor", "qty": "5"}, "fb", "hb")
+    db.add({"id": "c", "type": "ic", "qty": "x"}, "fc", "hc")
+    db.update("b", {"type": "capacitor", "qty": "3 pc"})
+    db.update("a", {"description": "unchanged stats"})
+    db.delete("c")
+
+    stats = db.get_stats()
+    assert stats["types"] == {"resistor": 1, "capacitor": 1}
+    assert stats["total_quantity"] == 13
+    db.close()
+    assert JSONDB(tmp_path / "db.json").get_stats()["types"] == stats["types"]
+
+
+def test_sqlite_import_from_sqlite(tmp_path):
+    src = SQLiteDB(tmp_path / "src.sqlite")
+    src.add({"id": "a", "type": "resistor"}, "f1", "h1")
+    src.add({"id": "b", "type": "capacitor"}, "f2", "h2")
+    src.close()
+
+    db = SQLiteDB(tmp_path / "dst.sqlite")
+    db.add({"id": "z", "type": "ic"}, "f2", "hz")
+    db.import_db(tmp_path / "src.sqlite")
+    assert [e["id"] for e in db.list_all()] == ["z", "a"]
+    assert [e["id"] for e in db.search("resistor")] == ["a"]
+    # Importing again is a no-op
+    db.import_db(tmp_path / "src.sqlite")
+    assert db.count() == 2
+    # The import refreshed the planner statistics for the indexes
+    analyzed = {row[0] for row in db.conn.execute("SELECT idx FROM sqlite_stat1")}
+    assert {"idx_components_file", "idx_components_hash"} <= analyzed
+
+
+def test_json_db_batches_journal_writes(tmp_path):
+    import json
+
+    path = tmp_path / "db.json"
+    db = JSONDB(path)
+    with db:
+        db.add({"id": "a"}, "f1", "h1")
+        db.add({"id": "b"}, "f2", "h2")
+        # Still buffered in the process
+        assert db.journal_path.read_text() == ""
+        db.flush()
+        assert len(db.journal_path.read_text().splitlines()) == 2
+        db.add({"id": "c"}, "f3", "h3")
+    # Leaving the block fsyncs the journal but leaves compaction to close()
+    assert len(db.journal_path.read_text().splitlines()) == 3
+    assert json.loads(path.read_text()) == []
+    assert [e["id"] for e in JSONDB(path).entries] == ["a", "b", "c"]
+    db.close()
+    assert not db.journal_path.exists()
+    assert [e["id"] for e in json.loads(path.read_text())] == ["a", "b", "c"]
+
+
+def test_jsonld_generated_ids_are_stable_across_processes(tmp_path):
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "from pathlib import Path\n"
+        "from hardware.inventory.utils import normalize_jsonld_component\n"
+        "c = normalize_jsonld_component({'@type': 'Transistor', 'quantity': 3}, 'transistors', Path('x.jsonld'))\n"
+        "print(c['id'], c['hash'])\n"
+    )
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env={**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": src},
+            capture_output=True, text=True, check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+    assert outputs.pop().startswith("t_")
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_import_streams_jsonld(tmp_path, monkeypatch, streaming):
+    from hardware.inventory import utils
+
+    if streaming:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(utils, "ijson", None)
+    src = tmp_path / "inv.jsonld"
+    src.write_text(utils._json_dumps({"@graph": [
+        {"@type": "Other"},
+        {"@type": "ComponentCollection", "resistors": [
+            {"resistance": 4.7, "resistanceUnit": "kohms", "quantity": 3},
+            {"resistance": 10, "resistanceUnit": "ohms"},
+        ]},
+    ]}))
+    expected = utils.parse_jsonld_components(utils._json_loads(src.read_bytes()), src)
+    assert list(utils._iter_import_components(src)) == expected
+
+    monkeypatch.setattr(SQLiteDB, "IMPORT_BATCH", 1)
+    db = SQLiteDB(":memory:")
+    db.import_db(src)
+    assert sorted(e["id"] for e in db.list_all()) == ["r_10_ohm", "r_4.7_kohm"]
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_list_all_filters_by_type(tmp_path, backend):
+    db = JSONDB(tmp_path / "db.json") if backend == "json" else SQLiteDB(":memory:")
+    for i, kind in enumerate(["resistor", "Capacitor", "resistor", "capacitor", "capacitor"]):
+        db.add({"id": f"c{i}", "type": kind}, f"f{i}", f"h{i}")
+
+    assert db.count("CAPACITOR") == 3
+    assert db.count() == 5
+    assert [e["id"] for e in db.list_all(component_type="capacitor")] == ["c1", "c3", "c4"]
+    assert [e["id"] for e in db.list_all(limit=1, offset=1, component_type="capacitor")] == ["c3"]
+    assert db.list_all(component_type="diode") == []
+    if backend == "sqlite":
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN " + SQLiteDB._SQL_LIST_TYPE, ("capacitor", -1, 0)
+        ).fetchall()
+        assert "idx_components_type_nocase" in str(plan)
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_list_brief(tmp_path, backend):
+    db = JSONDB(tmp_path / "db.json") if backend == "json" else SQLiteDB(":memory:")
+    db.add({"id": "r1", "type": "resistor", "value": "10k", "qty": 5}, "f1", "h1")
+    db.add({"id": "c1", "type": "Capacitor", "description": "no value"}, "f2", "h2")
+    db.add({"id": "c2", "type": "capacitor", "value": "1uF", "qty": "3"}, "f3", "h3")
+
+    assert db.list_brief() == [
+        ("r1", "resistor", "10k", 5),
+        ("c1", "Capacitor", None, None),
+        ("c2", "capacitor", "1uF", "3"),
+    ]
+    assert db.list_brief(limit=1, offset=1, component_type="CAPACITOR") == [
+        ("c2", "capacitor", "1uF", "3")
+    ]
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_untyped_entries_listed_as_unknown(tmp_path, backend):
+    db = JSONDB(tmp_path / "db.json") if backend == "json" else SQLiteDB(":memory:")
+    db.add({"id": "r", "type": "resistor"}, "f1", "h1")
+    db.add({"id": "missing"}, "f2", "h2")
+    db.add({"id": "null", "type": None}, "f3", "h3")
+    db.add({"id": "named", "type": "Unknown"}, "f4", "h4")
+
+    assert db.get_stats()["types"] == {"resistor": 1, "unknown": 2, "Unknown": 1}
+    assert db.count("unknown") == 3
+    assert sorted(e["id"] for e in db.list_all(component_type="unknown")) == ["missing", "named", "null"]
+    assert sorted(row[0] for row in db.list_brief(component_type="UNKNOWN")) == ["missing", "named", "null"]
+    assert [e["id"] for e in db.list_all(component_type="resistor")] == ["r"]
+    assert db.count("resistor") == 1
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_search_limit(tmp_path, backend):
+    db = JSONDB(tmp_path / "db.json") if backend == "json" else SQLiteDB(":memory:")
+    for i in range(5):
+        db.add({"id": f"r{i}", "description": f"Resistor {i}k"}, f"f{i}", f"h{i}")
+
+    assert [e["id"] for e in db.search("resistor", limit=2)] == ["r0", "r1"]
+    assert [e["id"] for e in db.search("k", limit=3)] == ["r0", "r1", "r2"]
+    assert len(db.search("resistor")) == 5
+
+
+@pytest.mark.parametrize("query, field", [
+    ("ω", None),
+    ("10KΩ", None),
+    ("tor 10k", None),
+    ("R 10", None),
+    ("ω", "value"),
+    ("PLATINUM", "description"),
+    ("ü", "color"),
+])
+def test_search_matches_across_backends(tmp_path, query, field):
+    entries = [
+        {"id": "r", "type": "Resistor", "value": "10kΩ", "color": "Grün"},
+        {"id": "t", "type": "Thermistor", "value": "PT100", "description": "Platinum sensor"},
+        {"id": "c", "type": "capacitor", "value": "1µF"},
+    ]
+    results = []
+    for db in (JSONDB(tmp_path / "db.json"), SQLiteDB(":memory:")):
+        for i, entry in enumerate(entries):
+            db.add(dict(entry), f"f{i}", f"h{i}")
+        results.append([e["id"] for e in db.search(query, field)])
+    assert results[0] == results[1]
+    assert results[0]
+
+
+def test_sqlite_stats_cache_invalidated_by_any_writer(tmp_path):
+    path = tmp_path / "db.sqlite"
+    db = SQLiteDB(path)
+    db.add({"id": "a", "type": "resistor"}, "fa", "ha")
+    assert db.get_stats()["total_components"] == 1
+    db.get_stats()["types"]["resistor"] = 99  # callers get their own copy
+    assert db.get_stats()["types"] == {"resistor": 1}
+
+    db.update("a", {"type": "ic"})
+    assert db.get_stats()["types"] == {"ic": 1}
+
+    other = SQLiteDB(path)
+    other.add({"id": "b", "type": "ic"}, "fb", "hb")
+    other.close()
+    assert db.get_stats()["types"] == {"ic": 2}
+
+
+def test_sqlite_search_cache_invalidated_by_any_writer(tmp_path, monkeypatch):
+    path = tmp_path / "db.sqlite"
+    db = SQLiteDB(path)
+    db.add({"id": "a", "description": "Resistor 10k"}, "fa", "ha")
+    assert [e["id"] for e in db.search("resistor")] == ["a"]
+    db.search("resistor")[0]["id"] = "mutated"  # callers get their own copy
+
+    calls = []
+    run = db._search_rows
+    monkeypatch.setattr(db, "_search_rows", lambda *a: calls.append(a) or run(*a))
+    assert [e["id"] for e in db.search("resistor")] == ["a"]
+    assert calls == []
+
+    other = SQLiteDB(path)
+    other.add({"id": "b", "description": "Resistor 1k"}, "fb", "hb")
+    other.close()
+    assert [e["id"] for e in db.search("resistor")] == ["a", "b"]
+    db.delete("a")
+    assert [e["id"] for e in db.search("resistor")] == ["b"]
+    assert len(calls) == 2
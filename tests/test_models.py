@@ -0,0 +1,6 @@
+from hardware.inventory.models import Component
+
+
+def test_quantity_extracted_from_qty():
+    comp = Component(id="a", type="resistor", qty="25 pcs", quantity=None)
+    assert comp.quantity == 25
@@ -1,7 +1,9 @@
+import asyncio
 from pathlib import Path
 
 import pytest
 
+from hardware.inventory import utils
 from hardware.inventory.utils import ocr_extract, parse_fields, text_hash
 
 
@@ -20,10 +22,10 @@ def test_ocr_extract_and_parse(monkeypatch, tmp_path):
     img = tmp_path / "image.png"
     img.write_bytes(b"x")
 
-    def fake_post(url, files):
+    def fake_post(url, **kwargs):
         return DummyResp({"ParsedResults": [{"ParsedText": "100uF 5 pcs $1.50"}]})
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr(utils._SESSION, "post", fake_post)
     text = ocr_extract(img, "ocr.space")
     assert "100uF" in text
 
@@ -34,3 +36,372 @@ def test_ocr_extract_and_parse(monkeypatch, tmp_path):
 
     h = text_hash(text)
     assert len(h) == 40
+
+
+def test_parse_fields_type_priority():
+    # Keyword order in the text doesn't matter: the higher-priority type wins
+    assert parse_fields("LED driver chip")["type"] == "ic"
+    assert parse_fields("coil, MOSFET and a resistor")["type"] == "resistor"
+    assert "type" not in parse_fields("unlabelled part")
+
+
+def test_text_hash_accepts_bytes():
+    assert text_hash("10k resistor") == text_hash("10k resistor".encode("utf-8"))
+    assert text_hash("10k resistor") != text_hash("10k resistors")
+    assert len(text_hash(b"")) == 40
+
+
+def test_text_hash_chunked_and_stream_agree():
+    import io
+
+    text = "Ω resistor 10k\n" * 20000  # spans several encode slices
+    data = text.encode("utf-8")
+    assert text_hash(text) == text_hash(data)
+    assert utils.text_hash_stream(io.BytesIO(data)) == text_hash(data)
+
+
+def test_text_hashes_include_legacy_sha1():
+    import hashlib
+
+    current, legacy = utils.text_hashes("10k resistor")
+    assert current == text_hash("10k resistor")
+    assert legacy == hashlib.sha1(b"10k resistor").hexdigest()
+
+
+def test_add_skips_text_stored_under_legacy_sha1(monkeypatch, tmp_path):
+    import hashlib
+
+    from hardware.inventory import cli
+    from hardware.inventory.utils import SQLiteDB
+
+    db = SQLiteDB(":memory:")
+    db.add({"id": "old"}, "old.png", hashlib.sha1(b"10k resistor").hexdigest())
+    reviewed = []
+    monkeypatch.setattr(cli, "_review", lambda candidate, db, service: reviewed.append(1))
+    cli._process(tmp_path / "new.png", "10k resistor", db, None, [], [])
+    assert reviewed == []
+    assert db.count() == 1
+
+
+def test_ocr_extract_many_preserves_order(monkeypatch, tmp_path):
+    paths = [tmp_path / f"{i}.png" for i in range(5)]
+    monkeypatch.setattr(utils, "ocr_extract", lambda path, service: f"{service}:{path.stem}")
+
+    texts = asyncio.run(utils.ocr_extract_many(paths, "mistral", concurrency=2))
+    assert texts == [f"mistral:{i}" for i in range(5)]
+
+
+def test_ocr_extract_many_rate_limited(monkeypatch, tmp_path):
+    import time
+
+    starts = []
+
+    def fake_extract(path, service):
+        starts.append(time.monotonic())
+        return path.stem
+
+    monkeypatch.setattr(utils, "ocr_extract", fake_extract)
+    paths = [tmp_path / f"{i}.png" for i in range(4)]
+    texts = asyncio.run(utils.ocr_extract_many(paths, "mistral", concurrency=4, rps=20))
+    assert texts == ["0", "1", "2", "3"]
+    starts.sort()
+    # Four starts at 20 rps span at least three 50 ms intervals
+    assert starts[-1] - starts[0] >= 0.14
+
+
+def test_encode_image_base64(tmp_path):
+    import base64
+
+    img = tmp_path / "image.png"
+    payload = bytes(range(256)) * 10
+    img.write_bytes(payload)
+    assert base64.b64decode(utils._encode_image_base64(img)) == payload
+
+    empty = tmp_path / "empty.png"
+    empty.write_bytes(b"")
+    assert utils._encode_image_base64(empty) == ""
+
+
+def test_encode_image_data_url_spans_chunks(tmp_path):
+    import base64
+
+    img = tmp_path / "photo.jpg"
+    payload = bytes(range(256)) * 1000  # several 57 KiB chunks plus a tail
+    img.write_bytes(payload)
+    prefix, encoded = utils._encode_image_data_url(img).split(",", 1)
+    assert prefix == "data:image/jpeg;base64"
+    assert encoded == base64.b64encode(payload).decode("ascii")
+
+
+def test_encode_image_data_url_reencodes_edited_file(tmp_path):
+    import os
+
+    img = tmp_path / "photo.png"
+    img.write_bytes(b"first")
+    first = utils._encode_image_data_url(img)
+    assert utils._encode_image_data_url(img) is first
+    img.write_bytes(b"second!")
+    os.utime(img, ns=(1, 1))
+    assert utils._encode_image_data_url(img) != first
+
+
+def test_encode_image_data_url_shrinks_large_images(tmp_path):
+    import base64
+    import io
+
+    Image = pytest.importorskip("PIL.Image")
+
+    small = tmp_path / "small.png"
+    Image.new("RGB", (64, 32), "white").save(small)
+    assert utils._encode_image_data_url(small).startswith("data:image/png;base64,")
+
+    large = tmp_path / "large.png"
+    Image.new("RGB", (4096, 1024), "white").save(large)
+    prefix, encoded = utils._encode_image_data_url(large).split(",", 1)
+    assert prefix == "data:image/jpeg;base64"
+    with Image.open(io.BytesIO(base64.b64decode(encoded))) as shrunk:
+        assert shrunk.size == (2048, 512)
+
+
+def test_parse_fields_returns_independent_copies():
+    first = parse_fields("10kΩ resistor 5 pcs")
+    first["value"] = "edited"
+    assert parse_fields("10kΩ resistor 5 pcs")["value"] == "10kΩ"
+
+
+def test_multipart_body_streams_file(tmp_path):
+    from email.parser import BytesParser
+    from email.policy import default
+
+    img = tmp_path / 'my "board".png'
+    payload = bytes(range(256)) * 1000
+    img.write_bytes(payload)
+
+    with img.open("rb") as fh:
+        body = utils._MultipartFileBody(fh, "file", img.name, "image/png")
+        raw = b"".join(body)
+        assert len(raw) == len(body)
+
+    message = BytesParser(policy=default).parsebytes(
+        f"Content-Type: {body.content_type}\r\n\r\n".encode() + raw
+    )
+    (part,) = message.iter_parts()
+    assert part.get_param("name", header="content-disposition") == "file"
+    assert part.get_content_type() == "image/png"
+    assert part.get_payload(decode=True) == payload
+
+
+class StatusResp(DummyResp):
+    def __init__(self, status_code, data=None, headers=None):
+        super().__init__(data or {})
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_post_with_retry_backs_off_on_throttling(monkeypatch):
+    import requests
+
+    responses = [
+        StatusResp(429, headers={"Retry-After": "2"}),
+        requests.ConnectionError("reset"),
+        StatusResp(200, {"ok": True}),
+    ]
+    sleeps = []
+
+    def fake_post(url, **kwargs):
+        item = responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    monkeypatch.setattr(utils._SESSION, "post", fake_post)
+    monkeypatch.setattr(utils.time, "sleep", sleeps.append)
+    resp = utils._post_with_retry("https://example.invalid", json={})
+    assert resp.status_code == 200
+    assert len(sleeps) == 2
+    assert 2 <= sleeps[0] < 2.5  # Retry-After honoured
+    assert 2 <= sleeps[1] < 2.5  # base * 2 ** 1
+
+
+def test_post_with_retry_gives_up(monkeypatch):
+    calls = []
+
+    def fake_post(url, **kwargs):
+        calls.append(url)
+        return StatusResp(503)
+
+    monkeypatch.setattr(utils._SESSION, "post", fake_post)
+    monkeypatch.setattr(utils.time, "sleep", lambda s: None)
+    assert utils._post_with_retry("https://example.invalid", max_attempts=3).status_code == 503
+    assert len(calls) == 3
+
+
+def test_ocr_extract_batch_one_request_per_chunk(monkeypatch, tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"img{i}.png"
+        path.write_bytes(b"img%d" % i)
+        paths.append(path)
+    payloads = []
+    models = set()
+
+    def fake_post(url, **kwargs):
+        images = [p for p in kwargs["json"]["messages"][0]["content"] if p["type"] == "image_url"]
+        payloads.append(images)
+        models.add(kwargs["json"]["model"])
+        reply = "```json\n" + utils._json_dumps([f"text {len(payloads)}.{i}" for i in range(len(images))]) + "\n```"
+        return StatusResp(200, {"choices": [{"message": {"content": reply}}]})
+
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    monkeypatch.setattr(utils._SESSION, "post", fake_post)
+    results = utils.ocr_extract_batch(paths, "openai", batch_size=3)
+    assert [len(images) for images in payloads] == [3, 2]
+    assert models == {utils.DEFAULT_MODELS["openai"]}
+    assert results == ["text 1.0", "text 1.1", "text 1.2", "text 2.0", "text 2.1"]
+
+
+def test_ocr_extract_batch_retries_misaligned_reply_per_image(monkeypatch, tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"img{i}.png"
+        path.write_bytes(b"img%d" % i)
+        paths.append(path)
+    sizes = []
+
+    def fake_post(url, **kwargs):
+        images = [p for p in kwargs["json"]["messages"][0]["content"] if p["type"] == "image_url"]
+        sizes.append(len(images))
+        if len(sizes) == 1:
+            content = '["only one"]'
+        elif len(images) > 1:
+            content = utils._json_dumps([f"batch {i}" for i in range(len(images))])
+        else:
+            content = f"single {len(sizes)}"
+        return StatusResp(200, {"choices": [{"message": {"content": content}}]})
+
+    monkeypatch.setenv("MISTRAL_API_KEY", "key")
+    monkeypatch.setattr(utils._SESSION, "post", fake_post)
+    results = utils.ocr_extract_batch(paths, "mistral", batch_size=2)
+    # The misaligned first batch is resent one image at a time; the second
+    # batch's results are kept
+    assert sizes == [2, 1, 1, 2]
+    assert results == ["single 2", "single 3", "batch 0", "batch 1"]
+
+
+def test_ocr_extract_caches_by_image_content(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_post(url, **kwargs):
+        calls.append(url)
+        return DummyResp({"text": "10k resistor"})
+
+    monkeypatch.setattr(utils._SESSION, "post", fake_post)
+    first, copy = tmp_path / "a.png", tmp_path / "b.png"
+    first.write_bytes(b"same image")
+    copy.write_bytes(b"same image")
+    assert ocr_extract(first, "local") == "10k resistor"
+    assert ocr_extract(copy, "local") == "10k resistor"
+    assert len(calls) == 1
+    # A different service is a different cache entry
+    ocr_extract(first, "ocr.space")
+    assert len(calls) == 2
+
+
+def test_ocr_blank_results_are_not_cached(monkeypatch, tmp_path):
+    replies = iter(["  \n", "10k resistor", "unused"])
+    monkeypatch.setattr(utils._SESSION, "post", lambda url, **kw: DummyResp({"text": next(replies)}))
+    image = tmp_path / "a.png"
+    image.write_bytes(b"image")
+    assert ocr_extract(image, "local").strip() == ""
+    assert ocr_extract(image, "local") == "10k resistor"
+    assert ocr_extract(image, "local") == "10k resistor"
+
+
+def test_ocr_cache_key_tracks_model_and_prompt(monkeypatch, tmp_path):
+    image = tmp_path / "a.png"
+    image.write_bytes(b"image")
+    key = utils._ocr_cache_path(image, "openai")
+    monkeypatch.setitem(utils.DEFAULT_MODELS, "openai", "gpt-next")
+    assert utils._ocr_cache_path(image, "openai") != key
+    monkeypatch.undo()
+    monkeypatch.setattr(utils, "_OCR_CACHE_TAG", "edited")
+    assert utils._ocr_cache_path(image, "openai") != key
+
+
+def test_api_connectivity_many_runs_checks_concurrently(monkeypatch):
+    import threading
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_check(service):
+        barrier.wait()  # only passes if all three checks are in flight together
+        return service != "gemini"
+
+    monkeypatch.setattr(utils, "test_api_connectivity", fake_check)
+    result = utils.test_api_connectivity_many(["mistral", "gemini", "openai"])
+    assert result == {"mistral": True, "gemini": False, "openai": True}
+    assert utils.test_api_connectivity_many([]) == {}
+
+
+def test_add_command_prefetches_ocr(monkeypatch, tmp_path):
+    import threading
+
+    from hardware.inventory import cli
+    from hardware.inventory.utils import SQLiteDB
+
+    for name in ("a.png", "b.png", "c.png"):
+        (tmp_path / name).write_bytes(name.encode())
+    db = SQLiteDB(":memory:")
+    db.add({"id": "done"}, str(tmp_path / "a.png"), "h-done")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_ocr(path, service):
+        barrier.wait()  # b and c must be in flight together
+        return f"{path.stem} 10k resistor"
+
+    monkeypatch.setattr(utils, "ocr_extract", fake_ocr)
+    monkeypatch.setattr(cli, "_resolve_db_paths", lambda args: db)
+    monkeypatch.setattr(cli, "_review", lambda candidate, db, service: dict(candidate))
+    cli.main(["add", str(tmp_path), "--continue", "--service", "local", "--jobs", "2"])
+    assert [e["description"] for e in db.list_all()[1:]] == ["b 10k resistor", "c 10k resistor"]
+
+
+def test_add_command_bounds_ocr_lookahead(monkeypatch, tmp_path):
+    from hardware.inventory import cli
+    from hardware.inventory.utils import SQLiteDB
+
+    for i in range(6):
+        (tmp_path / f"{i}.png").write_bytes(b"%d" % i)
+    db = SQLiteDB(":memory:")
+    submitted = []
+    in_flight_at_review = []
+
+    def fake_ocr(path, service):
+        submitted.append(path.stem)
+        return f"{path.stem} 10k resistor"
+
+    def fake_review(candidate, db, service):
+        in_flight_at_review.append(len(submitted))
+        return dict(candidate)
+
+    monkeypatch.setattr(utils, "ocr_extract", fake_ocr)
+    monkeypatch.setattr(cli, "_resolve_db_paths", lambda args: db)
+    monkeypatch.setattr(cli, "_review", fake_review)
+    cli.main(["add", str(tmp_path), "--service", "local", "--jobs", "2"])
+    # While file i is reviewed, OCR has reached at most file i + --jobs
+    assert all(n <= i + 3 for i, n in enumerate(in_flight_at_review))
+    assert db.count() == 6
+
+
+def test_parse_fields_description_from_first_usable_line():
+    assert parse_fields("")["description"] == "Component"
+    assert parse_fields("  LM358 op-amp \nmore")["description"] == "LM358 op-amp"
+    long_list = "- " + "x" * 130 + "\n\nBC547 transistor\nrest"
+    assert parse_fields(long_list)["description"] == "BC547 transistor"
+
+
+@pytest.mark.parametrize("sep", ["\r", "\r\n", "\x0c", "\x85", "\u2028"])
+def test_parse_fields_description_honours_all_line_breaks(sep):
+    assert parse_fields(f"LM358 op-amp{sep}more")["description"] == "LM358 op-amp"
+    long_list = "- " + "x" * 130 + sep + sep + "BC547 transistor" + sep + "rest"
+    assert parse_fields(long_list)["description"] == "BC547 transistor"
@@ -43,7 +43,7 @@ class TestOCRServices:
         with pytest.raises(ValueError, match="Unknown OCR service"):
             utils.ocr_extract(self.test_image_path, "unknown_service")
     
-    @patch('requests.post')
+    @patch('hardware.inventory.utils._SESSION.post')
     def test_legacy_ocr_services(self, mock_post):
         """Test legacy OCR services (local, ocr.space) with file upload."""
         # Mock response for legacy services
@@ -56,7 +56,7 @@ class TestOCRServices:
         assert result == self.mock_ocr_response
         mock_post.assert_called_once()
     
-    @patch('requests.post')
+    @patch('hardware.inventory.utils._SESSION.post')
     def test_ocr_space_response_format(self, mock_post):
         """Test OCR.Space specific response format handling."""
         # OCR.Space returns data in ParsedResults format
@@ -71,7 +71,7 @@ class TestOCRServices:
         assert result == self.mock_ocr_response
     
     @patch('hardware.inventory.utils.os.getenv')
-    @patch('requests.post')
+    @patch('hardware.inventory.utils._SESSION.post')
     def test_mistral_ocr_api_call(self, mock_post, mock_getenv):
         """Test Mistral API call structure and parameters."""
         mock_getenv.return_value = "fake_mistral_key"
@@ -159,15 +159,13 @@ class TestDatabaseImport:
     """Test database import functionality with the example JSONLD data."""
     
     def setup_method(self):
-        """Setup test database."""
-        self.test_db_path = Path(tempfile.mkdtemp()) / "test_inventory.db"
-        self.db = utils.SQLiteDB(self.test_db_path)
+        """Setup an in-memory test database (nothing to clean up on disk)."""
+        self.db = utils.SQLiteDB(":memory:")
         self.example_data_path = Path(__file__).parent.parent / "data" / "electronics_updated_1.jsonld"
     
     def teardown_method(self):
-        """Cleanup test database."""
-        if self.test_db_path.exists():
-            self.test_db_path.unlink()
+        """Close the test database."""
+        self.db.close()
     
     def test_import_example_database(self):
         """Test importing the example JSONLD database."""
@@ -297,8 +295,8 @@ class TestCLICommands:
         if not self.example_data.exists():
             pytest.skip("Example database not found")
         
-        # Import data and test search
-        db = utils.SQLiteDB(self.test_db)
+        # Import data and test search; the on-disk path is covered above
+        db = utils.SQLiteDB(":memory:")
         db.import_db(self.example_data)
         
         # Test various search queries